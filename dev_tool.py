@@ -3,13 +3,14 @@
 
 import shutil
 import subprocess
+import sys
 
 from python.dev_tool import (
     DEFAULT_BUILD_DIR,
-    USER_SETTINGS,
     detect_generator,
     find_built_binary,
     get_setting,
+    get_user_settings,
     list_runnable_targets,
     main,
     prompt_for_choice,
@@ -19,9 +20,19 @@ from python.dev_tool import (
 )
 
 
+def __getattr__(name: str) -> object:
+    # USER_SETTINGS is loaded lazily; resolve it through the package.
+    if name == "USER_SETTINGS":
+        import python.dev_tool
+
+        return python.dev_tool.USER_SETTINGS
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
 if __name__ == "__main__":
     try:
-        raise SystemExit(main())
+        rc = main()
     except subprocess.CalledProcessError as exc:
-        print(f"\nCommand failed with exit code {exc.returncode}")
-        raise
+        print(f"\nCommand failed with exit code {exc.returncode}", file=sys.stderr)
+        rc = exc.returncode
+    sys.exit(rc)
@@ -1,5 +1,5 @@
 from .cli import main
-from .config import USER_SETTINGS, get_setting, set_settings
+from .config import get_setting, get_user_settings, set_settings
 from .constants import DEFAULT_BUILD_DIR
 from .project import find_built_binary, list_runnable_targets
 from .qt import detect_generator, resolve_qt_prefix
@@ -9,6 +9,7 @@ __all__ = [
     "DEFAULT_BUILD_DIR",
     "USER_SETTINGS",
     "get_setting",
+    "get_user_settings",
     "set_settings",
     "main",
     "detect_generator",
@@ -18,3 +19,12 @@ __all__ = [
     "find_built_binary",
     "list_runnable_targets",
 ]
+
+
+def __getattr__(name: str) -> object:
+    # USER_SETTINGS is loaded lazily; resolve it through the config module.
+    if name == "USER_SETTINGS":
+        from . import config
+
+        return config.USER_SETTINGS
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
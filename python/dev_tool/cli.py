@@ -11,21 +11,28 @@ Typical usage:
 from __future__ import annotations
 
 import argparse
+import functools
 import os
 import sys
+from dataclasses import dataclass
 from pathlib import Path
-from typing import Optional, Sequence
+from typing import Callable, Iterable, Optional, Sequence
 
 from .config import (
-    USER_SETTINGS,
     _parse_setting_arg,
+    _path_resolve,
     _print_settings,
     apply_settings_to_args,
+    clear_detection_cache,
+    ResolvedSettings,
     edit_settings_interactive,
+    get_resolved_settings,
+    get_user_settings,
     set_settings,
 )
 from .constants import DEFAULT_BUILD_TYPE, DEFAULT_QT_CREATOR_OUTPUT_DIR, DEFAULT_SETTINGS
 from .project import (
+    CMakeCache,
     build_targets,
     configure_project,
     find_built_binary,
@@ -35,6 +42,7 @@ from .project import (
 from .qml import choose_qml_file, open_qml_in_qt_creator
 from .qt import (
     check_library_updates,
+    clear_toolchain_caches,
     detect_compiler_flavor,
     detect_generator,
     download_qt_with_script,
@@ -45,383 +53,547 @@ from .qt import (
 from .utils import prompt_for_choice, prompt_yes_no, run_command
 
 
-def main(argv: Optional[Sequence[str]] = None) -> int:
-    parser = argparse.ArgumentParser(description=__doc__)
-
-    def add_common_arguments(p: argparse.ArgumentParser) -> None:
-        p.add_argument(
-            "--build-dir",
-            type=Path,
-            default=None,
-            help="Build directory (default: settings file or ./build)",
-        )
-        p.add_argument(
-            "--build-type",
-            default=None,
-            help="CMAKE_BUILD_TYPE for single-config generators (default: from settings or Debug)",
-        )
-        p.add_argument("--config", help="--config value for multi-config generators")
-        p.add_argument("--qt-prefix", help="Path to Qt installation root")
-        p.add_argument("--generator", help="CMake generator to use")
-        p.add_argument(
-            "--download-qt-if-missing",
-            action="store_true",
-            help="Automatically run download_qt6.py when Qt is not found.",
-        )
-        p.add_argument(
-            "--download-qt-version",
-            help="Qt version to fetch when auto-downloading (forwards to download_qt6.py).",
-        )
-        p.add_argument(
-            "--download-qt-compiler",
-            help="Qt compiler flavor/arch for auto-download (e.g. win64_mingw).",
-        )
-        p.add_argument(
-            "--download-qt-output-dir",
-            type=Path,
-            default=None,
-            help="Where to place auto-downloaded Qt (default: settings file or third_party/qt6).",
-        )
+def _add_common_arguments(p: argparse.ArgumentParser) -> None:
+    p.add_argument(
+        "--build-dir",
+        type=Path,
+        default=None,
+        help="Build directory (default: settings file or ./build)",
+    )
+    p.add_argument(
+        "--build-type",
+        default=None,
+        help="CMAKE_BUILD_TYPE for single-config generators (default: from settings or Debug)",
+    )
+    p.add_argument("--config", help="--config value for multi-config generators")
+    p.add_argument(
+        "--jobs",
+        "-j",
+        type=int,
+        default=None,
+        help="Parallel build jobs (default: CMAKE_BUILD_PARALLEL_LEVEL, or one per CPU for Make generators)",
+    )
+    p.add_argument("--qt-prefix", help="Path to Qt installation root")
+    p.add_argument(
+        "--force-configure",
+        action="store_true",
+        help="Re-run CMake configure even when the build dir's cache is up to date",
+    )
+    p.add_argument("--generator", help="CMake generator to use")
+    p.add_argument(
+        "--download-qt-if-missing",
+        action="store_true",
+        help="Automatically run download_qt6.py when Qt is not found.",
+    )
+    p.add_argument(
+        "--download-qt-version",
+        help="Qt version to fetch when auto-downloading (forwards to download_qt6.py).",
+    )
+    p.add_argument(
+        "--download-qt-compiler",
+        help="Qt compiler flavor/arch for auto-download (e.g. win64_mingw).",
+    )
+    p.add_argument(
+        "--download-qt-output-dir",
+        type=Path,
+        default=None,
+        help="Where to place auto-downloaded Qt (default: settings file or third_party/qt6).",
+    )
 
-    add_common_arguments(parser)
 
-    subparsers = parser.add_subparsers(dest="command")
+@functools.lru_cache(maxsize=1)
+def _common_arguments_parser() -> argparse.ArgumentParser:
+    """Build/toolchain options, registered once and shared via ``parents=``."""
+    p = argparse.ArgumentParser(add_help=False)
+    _add_common_arguments(p)
+    return p
 
-    build_parser = subparsers.add_parser(
-        "build",
-        help="Configure (if needed) and build the project",
-    )
-    add_common_arguments(build_parser)
-    build_parser.add_argument(
+
+def _build_build_parser(p: argparse.ArgumentParser) -> None:
+    p.add_argument(
         "--target",
         action="append",
         default=[],
         help="Specific targets to build (default: all)",
     )
 
-    test_parser = subparsers.add_parser(
-        "test",
-        help="Build and run tests via ctest",
-    )
-    add_common_arguments(test_parser)
-    test_parser.add_argument(
+
+def _build_test_parser(p: argparse.ArgumentParser) -> None:
+    p.add_argument(
         "ctest_args",
         nargs=argparse.REMAINDER,
         default=[],
         help="Arguments passed through to ctest",
     )
 
-    run_parser = subparsers.add_parser(
-        "run",
-        help="Build (unless --skip-build) and run a built target",
-    )
-    add_common_arguments(run_parser)
-    run_parser.add_argument(
+
+def _build_run_parser(p: argparse.ArgumentParser) -> None:
+    p.add_argument(
         "target",
         nargs="?",
         help="Executable target to run (omit to pick from detected list)",
     )
-    run_parser.add_argument(
+    p.add_argument(
         "program_args",
         nargs=argparse.REMAINDER,
         default=[],
         help="Arguments passed to the executable after '--'",
     )
-    run_parser.add_argument(
+    p.add_argument(
         "--skip-build",
         action="store_true",
         help="Run without rebuilding first",
     )
 
-    verify_parser = subparsers.add_parser(
-        "verify",
-        help="Check environment (compiler, cmake, generator, Qt prefix) and suggest fixes",
-    )
-    add_common_arguments(verify_parser)
 
-    updates_parser = subparsers.add_parser(
-        "check-updates",
-        help="Check Qt and vendored libraries for newer upstream releases",
+def _build_check_updates_parser(p: argparse.ArgumentParser) -> None:
+    p.add_argument(
+        "--refresh",
+        action="store_true",
+        help="Ignore cached upstream versions and query the network again",
     )
-    add_common_arguments(updates_parser)
 
-    download_parser = subparsers.add_parser(
-        "download-qt",
-        help="Fetch Qt using the bundled download_qt6.py helper",
-    )
-    download_parser.add_argument("--qt-version", help="Qt version to download")
-    download_parser.add_argument(
+
+def _build_download_qt_parser(p: argparse.ArgumentParser) -> None:
+    p.add_argument("--qt-version", help="Qt version to download")
+    p.add_argument(
         "--compiler",
         help="Qt compiler flavor/arch (e.g. win64_mingw, win64_msvc2022_64)",
     )
-    download_parser.add_argument(
+    p.add_argument(
         "--output-dir",
         type=Path,
         default=None,
         help="Destination directory (default: settings file or third_party/qt6)",
     )
-    download_parser.add_argument(
+    p.add_argument(
         "--base-url",
         help="Mirror base URL to pass through to download_qt6.py",
     )
-    download_parser.add_argument(
+    p.add_argument(
         "--with-tools",
         action="store_true",
         help="Also download Ninja and CMake via Qt maintenance tool archives.",
     )
 
-    qml_parser = subparsers.add_parser(
-        "open-qml",
-        help="Open a project QML file in Qt Creator",
-    )
-    qml_parser.add_argument(
+
+def _build_open_qml_parser(p: argparse.ArgumentParser) -> None:
+    p.add_argument(
         "qml_file",
         nargs="?",
         help="Path to QML file (default: choose from discovered project QML files)",
     )
-    qml_parser.add_argument(
+    p.add_argument(
         "--ensure-qt-creator",
         dest="ensure_qt_creator",
         action="store_true",
         default=True,
         help="If Qt Creator is missing, download it (includes qml2puppet for Designer). Default: on.",
     )
-    qml_parser.add_argument(
+    p.add_argument(
         "--no-ensure-qt-creator",
         dest="ensure_qt_creator",
         action="store_false",
         help="Skip auto-download of Qt Creator if it is missing.",
     )
-    qml_parser.add_argument(
+    p.add_argument(
         "--qt-creator-version",
         help="Qt Creator version to download when --ensure-qt-creator is set (default: latest).",
     )
-    qml_parser.add_argument(
+    p.add_argument(
         "--qt-creator-output-dir",
         type=Path,
         default=DEFAULT_QT_CREATOR_OUTPUT_DIR,
         help="Install location for auto-downloaded Qt Creator (default: third_party/qtcreator).",
     )
 
-    settings_parser = subparsers.add_parser(
-        "settings",
-        help="View or edit persisted defaults",
-    )
-    settings_parser.add_argument(
+
+def _build_settings_parser(p: argparse.ArgumentParser) -> None:
+    p.add_argument(
         "--set",
         action="append",
         default=[],
         metavar="KEY=VALUE",
         help=f"Update a setting (valid keys: {', '.join(DEFAULT_SETTINGS.keys())})",
     )
-    settings_parser.add_argument(
+    p.add_argument(
         "--unset",
         action="append",
         default=[],
         metavar="KEY",
         help="Reset a setting back to its built-in default",
     )
-    settings_parser.add_argument(
+    p.add_argument(
         "--print",
         action="store_true",
         help="Print the current settings and exit",
     )
-
-    menu_parser = subparsers.add_parser(
-        "menu",
-        help="Interactive mode to build, test, or run targets",
+    p.add_argument(
+        "--clear-detection-cache",
+        action="store_true",
+        help="Forget persisted compiler / Qt prefix detection results",
     )
-    add_common_arguments(menu_parser)
 
-    args = parser.parse_args(argv)
-    if args.command is None:
-        args.command = "menu" if sys.stdin.isatty() else "build"
 
-    if args.command == "build" and not hasattr(args, "target"):
-        args.target = []
-    if args.command == "test" and not hasattr(args, "ctest_args"):
-        args.ctest_args = []
-    if args.command == "run":
-        args.target = getattr(args, "target", None)
-        args.program_args = getattr(args, "program_args", [])
-        args.skip_build = getattr(args, "skip_build", False)
+class _LazySubParsersAction(argparse._SubParsersAction):
+    """
+    Subparsers whose arguments are only added once their command is chosen.
+    `dev_tool.py build` never builds the open-qml/settings/... option trees,
+    and top-level --help only needs the names and help strings.
+    """
+
+    def __init__(self, *args, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self._builders: dict[str, Callable[[argparse.ArgumentParser], None]] = {}
+
+    def add_lazy_parser(
+        self,
+        name: str,
+        help: str,
+        builder: Optional[Callable[[argparse.ArgumentParser], None]],
+        parents: Sequence[argparse.ArgumentParser] = (),
+    ) -> None:
+        self.add_parser(name, help=help, parents=list(parents))
+        if builder is not None:
+            self._builders[name] = builder
+
+    def __call__(self, parser, namespace, values, option_string=None) -> None:
+        builder = self._builders.pop(values[0], None)
+        if builder is not None:
+            builder(self._name_parser_map[values[0]])
+        super().__call__(parser, namespace, values, option_string)
+
+
+_SUBCOMMANDS: dict[str, tuple[str, Optional[Callable[[argparse.ArgumentParser], None]]]] = {
+    "build": (
+        "Configure (if needed) and build the project",
+        _build_build_parser,
+    ),
+    "test": (
+        "Build and run tests via ctest",
+        _build_test_parser,
+    ),
+    "run": (
+        "Build (unless --skip-build) and run a built target",
+        _build_run_parser,
+    ),
+    "verify": (
+        "Check environment (compiler, cmake, generator, Qt prefix) and suggest fixes",
+        None,
+    ),
+    "check-updates": (
+        "Check Qt and vendored libraries for newer upstream releases",
+        _build_check_updates_parser,
+    ),
+    "download-qt": (
+        "Fetch Qt using the bundled download_qt6.py helper",
+        _build_download_qt_parser,
+    ),
+    "open-qml": (
+        "Open a project QML file in Qt Creator",
+        _build_open_qml_parser,
+    ),
+    "settings": (
+        "View or edit persisted defaults",
+        _build_settings_parser,
+    ),
+    "menu": (
+        "Interactive mode to build, test, or run targets",
+        None,
+    ),
+}
+
+
+@dataclass
+class CommandContext:
+    """Toolchain inputs resolved once per invocation and shared by handlers."""
+
+    args: argparse.Namespace
+    build_dir: Path
+    generator: Optional[str]
+    generator_is_strict: bool
+    qt_prefix: Optional[Path]
+    build_type: str
+
+    def configure(self) -> CMakeCache:
+        """Check Qt/toolchain agreement, configure the build dir, return its cache."""
+        enforce_qt_toolchain_match(self.qt_prefix, self.generator)
+        self.generator = configure_project(
+            self.build_dir,
+            self.generator,
+            self.build_type,
+            self.qt_prefix,
+            generator_is_strict=self.generator_is_strict,
+            force=self.args.force_configure,
+        )
+        return CMakeCache.from_build_dir(self.build_dir)
 
-    args = apply_settings_to_args(args)
 
-    if args.command == "settings":
-        current = dict(USER_SETTINGS)
-        try:
-            set_pairs = dict(_parse_setting_arg(item) for item in args.set)
-        except ValueError as exc:
-            raise SystemExit(str(exc))
-
-        updated = current
-        if set_pairs or args.unset:
-            updated = set_settings(set_pairs, unset=args.unset)
-            print("Updated settings.")
-        if args.print or set_pairs or args.unset:
-            _print_settings(updated)
+def _make_context(args: argparse.Namespace) -> CommandContext:
+    generator = detect_generator(args.generator)
+    return CommandContext(
+        args=args,
+        build_dir=_path_resolve(args.build_dir),
+        generator=generator,
+        generator_is_strict=bool(args.generator or os.environ.get("CMAKE_GENERATOR")),
+        qt_prefix=ensure_qt_prefix(args=args, generator=generator),
+        build_type=args.build_type or DEFAULT_BUILD_TYPE,
+    )
+
+
+def _cmd_settings(args: argparse.Namespace) -> int:
+    if args.clear_detection_cache:
+        clear_detection_cache()
+        print("Cleared detection cache.")
+        if not (args.print or args.set or args.unset):
             return 0
-        new_settings = edit_settings_interactive(updated)
-        _print_settings(new_settings)
+    current = dict(get_user_settings())
+    try:
+        set_pairs = dict(map(_parse_setting_arg, args.set))
+    except ValueError as exc:
+        raise SystemExit(str(exc))
+
+    updated = current
+    if set_pairs or args.unset:
+        updated = set_settings(set_pairs, unset=args.unset)
+        clear_toolchain_caches()
+        print("Updated settings.")
+    if args.print or set_pairs or args.unset:
+        _print_settings(updated)
         return 0
+    new_settings = edit_settings_interactive(updated)
+    clear_toolchain_caches()
+    _print_settings(new_settings)
+    return 0
+
+
+def _cmd_download_qt(args: argparse.Namespace) -> int:
+    compiler_arg = args.compiler
+    if not compiler_arg and sys.platform.startswith("win"):
+        flavor = detect_compiler_flavor(None)
+        if flavor == "mingw":
+            compiler_arg = "win64_mingw"
+    download_qt_with_script(
+        qt_version=args.qt_version,
+        compiler=compiler_arg,
+        output_dir=args.output_dir,
+        base_url=args.base_url,
+        with_tools=args.with_tools,
+    )
+    return 0
 
-    if args.command == "download-qt":
-        compiler_arg = args.compiler
-        if not compiler_arg and sys.platform.startswith("win"):
-            flavor = detect_compiler_flavor(None)
-            if flavor == "mingw":
-                compiler_arg = "win64_mingw"
-        download_qt_with_script(
-            qt_version=args.qt_version,
-            compiler=compiler_arg,
-            output_dir=args.output_dir,
-            base_url=args.base_url,
-            with_tools=args.with_tools,
-        )
-        return 0
 
-    build_dir = args.build_dir.resolve()
-    generator = detect_generator(args.generator)
-    generator_is_strict = bool(args.generator or os.environ.get("CMAKE_GENERATOR"))
-    qt_prefix = ensure_qt_prefix(args=args, generator=generator)
-    build_type = args.build_type or DEFAULT_BUILD_TYPE
-
-    if args.command == "open-qml":
-        qml_path = choose_qml_file(getattr(args, "qml_file", None))
-        open_qml_in_qt_creator(
-            qml_path,
-            ensure_creator=getattr(args, "ensure_qt_creator", False),
-            creator_version=getattr(args, "qt_creator_version", None),
-            creator_output_dir=getattr(args, "qt_creator_output_dir", DEFAULT_QT_CREATOR_OUTPUT_DIR),
-        )
-        return 0
+def _cmd_open_qml(args: argparse.Namespace) -> int:
+    qml_path = choose_qml_file(args.qml_file)
+    open_qml_in_qt_creator(
+        qml_path,
+        ensure_creator=args.ensure_qt_creator,
+        creator_version=args.qt_creator_version,
+        creator_output_dir=args.qt_creator_output_dir,
+    )
+    return 0
 
-    if args.command == "check-updates":
-        ok = check_library_updates(getattr(args, "qt_prefix", None))
-        return 0 if ok else 1
-
-    if args.command == "verify":
-        ok = verify_environment(qt_prefix, generator, build_dir)
-        return 0 if ok else 1
-
-    if args.command == "build":
-        enforce_qt_toolchain_match(qt_prefix, generator)
-        generator = configure_project(
-            build_dir,
-            generator,
-            build_type,
-            qt_prefix,
-            generator_is_strict=generator_is_strict,
-        )
-        build_targets(build_dir, generator, build_type, args.target, args.config)
-        return 0
 
-    if args.command == "test":
-        enforce_qt_toolchain_match(qt_prefix, generator)
-        generator = configure_project(
-            build_dir,
-            generator,
-            build_type,
-            qt_prefix,
-            generator_is_strict=generator_is_strict,
-        )
-        build_targets(build_dir, generator, build_type, [], args.config)
-        run_tests(build_dir, generator, build_type, args.config, args.ctest_args)
-        return 0
+def _cmd_check_updates(args: argparse.Namespace) -> int:
+    ok = check_library_updates(args.qt_prefix, refresh=args.refresh)
+    return 0 if ok else 1
 
-    if args.command == "run":
-        enforce_qt_toolchain_match(qt_prefix, generator)
-        generator = configure_project(
-            build_dir,
-            generator,
-            build_type,
-            qt_prefix,
-            generator_is_strict=generator_is_strict,
-        )
+
+def _cmd_verify(ctx: CommandContext) -> int:
+    ok = verify_environment(ctx.qt_prefix, ctx.generator, ctx.build_dir)
+    return 0 if ok else 1
+
+
+def _cmd_build(ctx: CommandContext) -> int:
+    cmake_cache = ctx.configure()
+    build_targets(
+        ctx.build_dir,
+        ctx.generator,
+        ctx.build_type,
+        ctx.args.target,
+        ctx.args.config,
+        cache=cmake_cache,
+        jobs=ctx.args.jobs,
+    )
+    return 0
+
+
+def _cmd_test(ctx: CommandContext) -> int:
+    args = ctx.args
+    cmake_cache = ctx.configure()
+    build_targets(
+        ctx.build_dir, ctx.generator, ctx.build_type, [], args.config, cache=cmake_cache, jobs=args.jobs
+    )
+    run_tests(
+        ctx.build_dir, ctx.generator, ctx.build_type, args.config, args.ctest_args, cache=cmake_cache
+    )
+    return 0
+
+
+def _cmd_run(ctx: CommandContext) -> int:
+    args = ctx.args
+    cmake_cache = CMakeCache.from_build_dir(ctx.build_dir)
+    if args.skip_build and cmake_cache.entries:
+        # Nothing will be rebuilt, so an already-configured tree is all we need.
+        ctx.generator = cmake_cache.generator or ctx.generator
+    else:
+        cmake_cache = ctx.configure()
+    run_target = args.target
+    if not run_target:
+        # Only enumerate targets when the user has to pick one.
         available_targets = list_runnable_targets(
-            build_dir, generator, build_type, args.config
+            ctx.build_dir, ctx.generator, ctx.build_type, args.config, cache=cmake_cache
         )
-        run_target = args.target
-        if not run_target:
-            run_target = prompt_for_choice(
-                available_targets,
-                prompt="Select target to run",
-            )
-
-        if not args.skip_build:
-            build_targets(build_dir, generator, build_type, [run_target], args.config)
-        exe_path = find_built_binary(
-            build_dir, run_target, generator, build_type, args.config
+        run_target = prompt_for_choice(
+            available_targets,
+            prompt="Select target to run",
         )
-        run_command([str(exe_path), *args.program_args])
-        return 0
 
-    if args.command == "menu":
-        actions = ["verify", "build", "test", "run", "open-qml", "check-updates", "settings", "quit"]
-        choice = prompt_for_choice(actions, prompt="Select action")
-        if choice == "verify":
-            ok = verify_environment(args.qt_prefix, generator, build_dir)
-            return 0 if ok else 1
-        if choice == "build":
-            enforce_qt_toolchain_match(qt_prefix, generator)
-            generator = configure_project(
-                build_dir,
-                generator,
-                build_type,
-                qt_prefix,
-                generator_is_strict=generator_is_strict,
-            )
-            build_targets(build_dir, generator, build_type, [], args.config)
-            return 0
-        if choice == "test":
-            enforce_qt_toolchain_match(qt_prefix, generator)
-            generator = configure_project(
-                build_dir,
-                generator,
-                build_type,
-                qt_prefix,
-                generator_is_strict=generator_is_strict,
-            )
-            build_targets(build_dir, generator, build_type, [], args.config)
-            run_tests(build_dir, generator, build_type, args.config, [])
-            return 0
+    if not args.skip_build:
+        build_targets(
+            ctx.build_dir,
+            ctx.generator,
+            ctx.build_type,
+            [run_target],
+            args.config,
+            cache=cmake_cache,
+            jobs=args.jobs,
+        )
+    exe_path = find_built_binary(
+        ctx.build_dir, run_target, ctx.generator, ctx.build_type, args.config, cache=cmake_cache
+    )
+    run_command([str(exe_path), *args.program_args])
+    return 0
+
+
+# Argument values the menu supplies for commands whose options it never parsed.
+_MENU_ACTION_DEFAULTS: dict[str, dict[str, object]] = {
+    "build": {"target": []},
+    "test": {"ctest_args": []},
+    "run": {"target": None, "program_args": []},
+    "open-qml": {
+        "qml_file": None,
+        "ensure_qt_creator": True,
+        "qt_creator_version": None,
+        "qt_creator_output_dir": DEFAULT_QT_CREATOR_OUTPUT_DIR,
+    },
+    "check-updates": {"refresh": False},
+    "settings": {"set": [], "unset": [], "print": False, "clear_detection_cache": False},
+}
+
+
+MENU_ACTIONS = ("verify", "build", "test", "run", "open-qml", "check-updates", "settings", "quit")
+
+# Arguments apply_settings_to_args fills from settings when omitted on the CLI.
+_SETTINGS_BACKED_ARGS = (
+    "build_dir",
+    "build_type",
+    "qt_prefix",
+    "generator",
+    "download_qt_output_dir",
+    "download_qt_version",
+    "download_qt_compiler",
+)
+
+
+def _reapply_settings(args: argparse.Namespace, previous: ResolvedSettings) -> argparse.Namespace:
+    """
+    Replace values that were filled from the previous settings with the
+    current ones; values given explicitly on the command line are kept.
+    """
+    for name in _SETTINGS_BACKED_ARGS:
+        if getattr(args, name, None) == getattr(previous, name):
+            setattr(args, name, None)
+    return apply_settings_to_args(args)
+
+
+def _cmd_menu(ctx: CommandContext) -> int:
+    """
+    Keep offering actions until the user quits, so several actions share one
+    startup and one resolved context. The context is rebuilt after the
+    settings action. Returns the last action's exit code.
+    """
+    result = 0
+    while True:
+        choice = prompt_for_choice(MENU_ACTIONS, prompt="Select action")
+        if choice == "quit":
+            return result
+        vars(ctx.args).update(_MENU_ACTION_DEFAULTS.get(choice, {}))
         if choice == "run":
-            do_build = prompt_yes_no("Build before running?", default=True)
-            enforce_qt_toolchain_match(qt_prefix, generator)
-            generator = configure_project(
-                build_dir,
-                generator,
-                build_type,
-                qt_prefix,
-                generator_is_strict=generator_is_strict,
-            )
-            available_targets = list_runnable_targets(
-                build_dir, generator, build_type, args.config
-            )
-            target = prompt_for_choice(
-                available_targets,
-                prompt="Select target to run",
-            )
-            if do_build:
-                build_targets(build_dir, generator, build_type, [target], args.config)
-            exe_path = find_built_binary(
-                build_dir, target, generator, build_type, args.config
-            )
-            run_command([str(exe_path)])
-            return 0
-        if choice == "open-qml":
-            qml_path = choose_qml_file(None)
-            open_qml_in_qt_creator(qml_path, ensure_creator=True)
-            return 0
-        if choice == "check-updates":
-            check_library_updates(args.qt_prefix)
-            return 0
+            ctx.args.skip_build = not prompt_yes_no("Build before running?", default=True)
         if choice == "settings":
-            new_settings = edit_settings_interactive(USER_SETTINGS)
-            _print_settings(new_settings)
-            return 0
-        return 0
+            previous = get_resolved_settings()
+            result = _cmd_settings(ctx.args)
+            ctx = _make_context(_reapply_settings(ctx.args, previous))
+        elif choice in STANDALONE_COMMAND_HANDLERS:
+            result = STANDALONE_COMMAND_HANDLERS[choice](ctx.args)
+        else:
+            result = COMMAND_HANDLERS[choice](ctx)
+
+
+# Commands that never touch the toolchain (no generator/Qt detection).
+STANDALONE_COMMAND_HANDLERS: dict[str, Callable[[argparse.Namespace], int]] = {
+    "settings": _cmd_settings,
+    "download-qt": _cmd_download_qt,
+    "open-qml": _cmd_open_qml,
+    "check-updates": _cmd_check_updates,
+}
+
+COMMAND_HANDLERS: dict[str, Callable[[CommandContext], int]] = {
+    "verify": _cmd_verify,
+    "build": _cmd_build,
+    "test": _cmd_test,
+    "run": _cmd_run,
+    "menu": _cmd_menu,
+}
+
+
+# Commands that take the shared build/toolchain options.
+_COMMON_OPTION_COMMANDS = frozenset({"build", "test", "run", "verify", "check-updates", "menu"})
+
+
+def _build_parser(commands: Iterable[str]) -> argparse.ArgumentParser:
+    common = _common_arguments_parser()
+    parser = argparse.ArgumentParser(description=__doc__, parents=[common])
+    # A bare invocation falls back to build/menu without running a subparser;
+    # these keep their command-specific attributes defined. Subparsers
+    # override them with their own values when one is selected.
+    parser.set_defaults(target=[], ctest_args=[], program_args=[], skip_build=False)
+
+    parser.register("action", "parsers", _LazySubParsersAction)
+    subparsers = parser.add_subparsers(dest="command")
+    for name in commands:
+        help_text, builder = _SUBCOMMANDS[name]
+        parents = [common] if name in _COMMON_OPTION_COMMANDS else []
+        subparsers.add_lazy_parser(name, help_text, builder, parents)
+    return parser
+
+
+def _build_full_parser() -> argparse.ArgumentParser:
+    return _build_parser(_SUBCOMMANDS)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    argv = list(sys.argv[1:] if argv is None else argv)
+    # `dev_tool.py <command> ...` only needs that one subparser registered;
+    # help, leading global options and unknown commands get the full parser.
+    if argv and argv[0] in _SUBCOMMANDS:
+        parser = _build_parser([argv[0]])
+    else:
+        parser = _build_full_parser()
+
+    args = parser.parse_args(argv)
+    if args.command is None:
+        args.command = "menu" if sys.stdin.isatty() else "build"
+
+    args = apply_settings_to_args(args)
+
+    standalone = STANDALONE_COMMAND_HANDLERS.get(args.command)
+    if standalone is not None:
+        return standalone(args)
 
-    parser.error(f"Unhandled command {args.command}")
-    return 1
+    handler = COMMAND_HANDLERS.get(args.command)
+    if handler is None:
+        parser.error(f"Unhandled command {args.command}")
+        return 1
+    return handler(_make_context(args))
@@ -1,9 +1,13 @@
 import argparse
+import functools
 import json
 import os
 import sys
+import threading
+import time
+from dataclasses import dataclass
 from pathlib import Path
-from typing import Iterable, Optional
+from typing import Callable, Iterable, Optional, TypeVar, Union
 
 from .constants import (
     CONFIG_DIR_NAME,
@@ -13,10 +17,33 @@ from .constants import (
     DEFAULT_QT_CREATOR_OUTPUT_DIR,
     DEFAULT_SETTINGS,
     DEFAULT_RUN_TARGETS,
+    DETECT_CACHE_FILE_NAME,
     ROOT,
+    NET_CACHE_FILE_NAME,
     SETTING_DESCRIPTIONS,
 )
 
+T = TypeVar("T")
+
+try:
+    import orjson  # type: ignore
+except ImportError:  # optional speedup; stdlib json is the fallback
+    orjson = None
+
+
+def json_loads(data: Union[bytes, str]) -> object:
+    """Parse JSON with orjson when installed, else the stdlib json module."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def json_dumps(obj: object) -> bytes:
+    """Serialize to 2-space-indented UTF-8 JSON bytes."""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+    return json.dumps(obj, indent=2).encode("utf-8")
+
 
 def _config_dir() -> Path:
     if sys.platform.startswith("win"):
@@ -33,22 +60,155 @@ def _config_path() -> Path:
     return _config_dir() / CONFIG_FILE_NAME
 
 
+def _net_cache_path() -> Path:
+    return _config_dir() / NET_CACHE_FILE_NAME
+
+
+# Fetches may run on worker threads; serialize the read-modify-write below.
+_NET_CACHE_LOCK = threading.Lock()
+
+
+def _load_net_cache() -> dict:
+    try:
+        data = json_loads(_net_cache_path().read_bytes())
+    except Exception:
+        return {}
+    return data if isinstance(data, dict) else {}
+
+
+def disk_ttl_cache(name: str, *, ttl: float) -> Callable[[Callable[..., T]], Callable[..., T]]:
+    """
+    Persist a function's result under `name` in the config dir for `ttl` seconds.
+    The wrapped function must return a JSON-serializable tuple whose first
+    item is None on failure; failures are never cached. Pass refresh=True to
+    skip the cached value and fetch again.
+    """
+    def decorator(func: Callable[..., T]) -> Callable[..., T]:
+        @functools.wraps(func)
+        def wrapper(*args: object, refresh: bool = False, **kwargs: object) -> T:
+            if not refresh:
+                entry = _load_net_cache().get(name)
+                if (
+                    isinstance(entry, dict)
+                    and isinstance(entry.get("t"), (int, float))
+                    and time.time() - entry["t"] < ttl
+                ):
+                    return tuple(entry["v"])  # type: ignore[return-value]
+
+            result = func(*args, **kwargs)
+            if result and result[0] is not None:  # type: ignore[index]
+                with _NET_CACHE_LOCK:
+                    cache = _load_net_cache()
+                    cache[name] = {"t": time.time(), "v": list(result)}  # type: ignore[arg-type]
+                    path = _net_cache_path()
+                    try:
+                        path.parent.mkdir(parents=True, exist_ok=True)
+                        path.write_bytes(json_dumps(cache))
+                    except OSError:
+                        pass
+            return result
+
+        return wrapper
+
+    return decorator
+
+
+def _detect_cache_path() -> Path:
+    return _config_dir() / DETECT_CACHE_FILE_NAME
+
+
+def _load_detect_cache() -> dict:
+    try:
+        data = json_loads(_detect_cache_path().read_bytes())
+    except Exception:
+        return {}
+    return data if isinstance(data, dict) else {}
+
+
+def _mtime_stamp(paths: Iterable[str]) -> list[Optional[int]]:
+    stamp: list[Optional[int]] = []
+    for path in paths:
+        try:
+            stamp.append(os.stat(path).st_mtime_ns)
+        except OSError:
+            stamp.append(None)
+    return stamp
+
+
+def _detection_cache_get(key: str) -> object:
+    """
+    Return a persisted toolchain-detection result for key, or None when it is
+    missing or any path it was stamped with has changed since it was stored.
+    """
+    entry = _load_detect_cache().get(key)
+    if not isinstance(entry, dict) or not isinstance(entry.get("paths"), list):
+        return None
+    if entry.get("mtime_ns") != _mtime_stamp(entry["paths"]):
+        return None
+    return entry.get("value")
+
+
+def _detection_cache_put(key: str, value: object, paths: Iterable[str]) -> None:
+    paths = list(paths)
+    cache = _load_detect_cache()
+    cache[key] = {"value": value, "paths": paths, "mtime_ns": _mtime_stamp(paths)}
+    path = _detect_cache_path()
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(json_dumps(cache))
+    except OSError:
+        pass
+
+
+def clear_detection_cache() -> None:
+    """Forget persisted compiler / Qt prefix detection results."""
+    try:
+        _detect_cache_path().unlink()
+    except FileNotFoundError:
+        pass
+
+
+_SETTINGS_CACHE: Optional[tuple[tuple, dict]] = None
+
+
 def _load_settings_file() -> dict:
+    """Read settings.json, reusing the parsed dict while the file is unchanged."""
+    global _SETTINGS_CACHE
     path = _config_path()
-    if not path.exists():
+    try:
+        stat = path.stat()
+    except OSError:
         return {}
+    key = (str(path), stat.st_mtime_ns, stat.st_size)
+    if _SETTINGS_CACHE is not None and _SETTINGS_CACHE[0] == key:
+        return dict(_SETTINGS_CACHE[1])
     try:
-        data = json.loads(path.read_text(encoding="utf-8"))
+        data = json_loads(path.read_bytes())
     except Exception:
         return {}
-    return data if isinstance(data, dict) else {}
+    if not isinstance(data, dict):
+        return {}
+    _SETTINGS_CACHE = (key, data)
+    return dict(data)
+
+
+@functools.lru_cache(maxsize=64)
+def _path_expand(value: str) -> Path:
+    """Parse and expand a user-supplied path string once per distinct value."""
+    return Path(value).expanduser()
+
+
+@functools.lru_cache(maxsize=64)
+def _path_resolve(path: Path) -> Path:
+    """Path.resolve() (a realpath walk) once per distinct path."""
+    return path.resolve()
 
 
 def _normalized_setting(key: str, value: object) -> object:
     if value is None:
         return None
     if key in {"build_dir", "qt_prefix", "download_qt_output_dir"}:
-        return str(Path(str(value)).expanduser())
+        return str(_path_expand(str(value)))
     if key == "default_run_targets":
         if isinstance(value, str):
             parts = [part.strip() for part in value.replace(";", ",").split(",")]
@@ -60,40 +220,111 @@ def _normalized_setting(key: str, value: object) -> object:
 
 
 def _merge_settings(user_values: dict) -> dict:
-    merged = DEFAULT_SETTINGS.copy()
-    for key, value in user_values.items():
-        if key not in DEFAULT_SETTINGS:
-            continue
-        merged[key] = _normalized_setting(key, value)
-    return merged
+    return DEFAULT_SETTINGS | {
+        key: _normalized_setting(key, value)
+        for key, value in user_values.items()
+        if key in DEFAULT_SETTINGS
+    }
+
+
+@dataclass(frozen=True, slots=True)
+class ResolvedSettings:
+    """Typed view of USER_SETTINGS with paths and fallbacks applied once."""
+
+    build_dir: Path
+    build_type: str
+    qt_prefix: Optional[Path]
+    generator: Optional[str]
+    download_qt_output_dir: Path
+    download_qt_version: Optional[str]
+    download_qt_compiler: Optional[str]
+    default_run_targets: tuple[str, ...]
+
+
+def _resolve_settings(merged: dict) -> ResolvedSettings:
+    def _path(key: str) -> Optional[Path]:
+        value = merged.get(key)
+        return _path_expand(str(value)) if value else None
+
+    def _text(key: str) -> Optional[str]:
+        value = merged.get(key)
+        return str(value) if value else None
+
+    targets = merged.get("default_run_targets")
+    if not (isinstance(targets, list) and targets):
+        targets = DEFAULT_RUN_TARGETS
+    return ResolvedSettings(
+        build_dir=_path("build_dir") or DEFAULT_BUILD_DIR,
+        build_type=_text("build_type") or DEFAULT_BUILD_TYPE,
+        qt_prefix=_path("qt_prefix"),
+        generator=_text("generator"),
+        download_qt_output_dir=_path("download_qt_output_dir") or ROOT / "third_party" / "qt6",
+        download_qt_version=_text("download_qt_version"),
+        download_qt_compiler=_text("download_qt_compiler"),
+        default_run_targets=tuple(str(t) for t in targets),
+    )
 
 
 def save_settings(settings: dict) -> None:
     """Persist settings to disk and ensure parent dir exists."""
+    global _SETTINGS_CACHE
+    _SETTINGS_CACHE = None
     path = _config_path()
     path.parent.mkdir(parents=True, exist_ok=True)
-    sanitized = {
-        key: settings.get(key, DEFAULT_SETTINGS[key])
-        for key in DEFAULT_SETTINGS
+    sanitized = DEFAULT_SETTINGS | {
+        key: settings[key] for key in DEFAULT_SETTINGS if key in settings
     }
-    path.write_text(json.dumps(sanitized, indent=2), encoding="utf-8")
+    path.write_bytes(json_dumps(sanitized))
+
+
+# Loaded on first use so commands like --help never touch settings.json.
+_USER_SETTINGS: Optional[dict] = None
+_RESOLVED_SETTINGS: Optional[ResolvedSettings] = None
+
 
+def _ensure_loaded() -> dict:
+    global _USER_SETTINGS, _RESOLVED_SETTINGS
+    if _USER_SETTINGS is None:
+        _USER_SETTINGS = _merge_settings(_load_settings_file())
+        _RESOLVED_SETTINGS = _resolve_settings(_USER_SETTINGS)
+    return _USER_SETTINGS
 
-USER_SETTINGS = _merge_settings(_load_settings_file())
+
+def get_user_settings() -> dict:
+    """Return the merged settings dict, loading it on first access."""
+    return _ensure_loaded()
+
+
+def get_resolved_settings() -> ResolvedSettings:
+    _ensure_loaded()
+    assert _RESOLVED_SETTINGS is not None
+    return _RESOLVED_SETTINGS
+
+
+def __getattr__(name: str) -> object:
+    # Keep `config.USER_SETTINGS` / `from .config import USER_SETTINGS` working.
+    if name == "USER_SETTINGS":
+        return get_user_settings()
+    if name == "RESOLVED_SETTINGS":
+        return get_resolved_settings()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 def reload_settings() -> dict:
-    global USER_SETTINGS
-    USER_SETTINGS = _merge_settings(_load_settings_file())
-    return USER_SETTINGS
+    global _USER_SETTINGS, _RESOLVED_SETTINGS
+    _USER_SETTINGS = _merge_settings(_load_settings_file())
+    _RESOLVED_SETTINGS = _resolve_settings(_USER_SETTINGS)
+    return _USER_SETTINGS
 
 
 def get_setting(key: str) -> object:
-    return USER_SETTINGS.get(key, DEFAULT_SETTINGS.get(key))
+    return _ensure_loaded().get(key, DEFAULT_SETTINGS.get(key))
 
 
 def set_settings(updates: dict, *, unset: Iterable[str] = ()) -> dict:
-    current = dict(USER_SETTINGS)
+    global _RESOLVED_SETTINGS
+    settings = _ensure_loaded()
+    current = dict(settings)
     for key in unset:
         if key in DEFAULT_SETTINGS:
             current[key] = DEFAULT_SETTINGS[key]
@@ -101,45 +332,37 @@ def set_settings(updates: dict, *, unset: Iterable[str] = ()) -> dict:
         if key not in DEFAULT_SETTINGS:
             continue
         current[key] = _normalized_setting(key, value)
-    USER_SETTINGS.update(current)
-    save_settings(USER_SETTINGS)
-    return USER_SETTINGS
+    settings.update(current)
+    _RESOLVED_SETTINGS = _resolve_settings(settings)
+    save_settings(settings)
+    return settings
 
 
 def default_run_targets() -> list[str]:
-    targets = get_setting("default_run_targets")
-    if isinstance(targets, list) and targets:
-        return [str(t) for t in targets]
-    return DEFAULT_RUN_TARGETS
+    return list(get_resolved_settings().default_run_targets)
 
 
 def apply_settings_to_args(args: argparse.Namespace) -> argparse.Namespace:
     """Fill in defaults from settings when CLI arguments are omitted."""
-    def _path_from_setting(key: str, fallback: Path) -> Path:
-        value = get_setting(key)
-        return Path(value) if value else fallback
-
+    resolved = get_resolved_settings()
     if getattr(args, "build_dir", None) is None:
-        args.build_dir = _path_from_setting("build_dir", DEFAULT_BUILD_DIR)
+        args.build_dir = resolved.build_dir
     if getattr(args, "build_type", None) is None:
-        args.build_type = str(get_setting("build_type") or DEFAULT_BUILD_TYPE)
+        args.build_type = resolved.build_type
     if getattr(args, "qt_prefix", None) is None:
-        args.qt_prefix = get_setting("qt_prefix")
+        args.qt_prefix = resolved.qt_prefix
     if getattr(args, "generator", None) is None:
-        args.generator = get_setting("generator")
+        args.generator = resolved.generator
     if getattr(args, "download_qt_output_dir", None) is None:
-        args.download_qt_output_dir = _path_from_setting(
-            "download_qt_output_dir",
-            ROOT / "third_party" / "qt6",
-        )
+        args.download_qt_output_dir = resolved.download_qt_output_dir
     if hasattr(args, "output_dir") and getattr(args, "output_dir", None) is None:
         args.output_dir = args.download_qt_output_dir
     if getattr(args, "download_qt_version", None) is None:
-        args.download_qt_version = get_setting("download_qt_version")
+        args.download_qt_version = resolved.download_qt_version
     if hasattr(args, "qt_version") and getattr(args, "qt_version", None) is None:
         args.qt_version = args.download_qt_version
     if getattr(args, "download_qt_compiler", None) is None:
-        args.download_qt_compiler = get_setting("download_qt_compiler")
+        args.download_qt_compiler = resolved.download_qt_compiler
     if hasattr(args, "compiler") and getattr(args, "compiler", None) is None:
         args.compiler = args.download_qt_compiler
     return args
@@ -152,9 +375,9 @@ def _print_settings(settings: dict) -> None:
 
 
 def _parse_setting_arg(arg: str) -> tuple[str, str]:
-    if "=" not in arg:
+    key, sep, value = arg.partition("=")
+    if not sep:
         raise ValueError("Must be KEY=VALUE")
-    key, value = arg.split("=", 1)
     return key.strip(), value.strip()
 
 
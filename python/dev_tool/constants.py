@@ -1,59 +1,80 @@
 from pathlib import Path
+from types import MappingProxyType
 
 ROOT = Path(__file__).resolve().parents[2]
 
 DEFAULT_BUILD_DIR = ROOT / "build"
 DEFAULT_BUILD_TYPE = "Debug"
 DEFAULT_RUN_TARGETS = ["sample_app", "sample_cli"]
-NON_RUN_TARGETS = {
-    "all",
-    "ALL_BUILD",
-    "RUN_TESTS",
-    "test",
-    "install",
-    "help",
-    "clean",
-    "ZERO_CHECK",
-}
-HELP_URLS = {
-    "cmake": "https://cmake.org/download/",
-    "ninja": "https://ninja-build.org/",
-    "qt": "https://www.qt.io/download",
-    "download_script": "python download_qt6.py",
-    "qt_creator": "https://www.qt.io/product/development-tools",
-}
-PACKAGE_NAMES = {
-    "ninja": {
-        "apt": "ninja-build",
-        "dnf": "ninja-build",
-        "brew": "ninja",
-        "choco": "ninja",
-    },
-    "cmake": {
-        "apt": "cmake",
-        "dnf": "cmake",
-        "brew": "cmake",
-        "choco": "cmake",
-    },
-    "qtcreator": {
-        "apt": "qtcreator",
-        "dnf": "qt-creator",
-        "brew": "qt-creator",
-        "choco": "qtcreator",
-    },
-    "qt": {
-        "apt": "qt6-base-dev qt6-declarative-dev",
-        "dnf": "qt6-qtbase-devel qt6-qtdeclarative-devel",
-        "brew": "qt@6",
-        "choco": "qt-lts-long-term-release",
-    },
-}
+NON_RUN_TARGETS = frozenset(
+    {
+        "all",
+        "ALL_BUILD",
+        "RUN_TESTS",
+        "test",
+        "install",
+        "help",
+        "clean",
+        "ZERO_CHECK",
+    }
+)
+# Read-only lookup tables shared by every hint message.
+HELP_URLS = MappingProxyType(
+    {
+        "cmake": "https://cmake.org/download/",
+        "ninja": "https://ninja-build.org/",
+        "qt": "https://www.qt.io/download",
+        "download_script": "python download_qt6.py",
+        "qt_creator": "https://www.qt.io/product/development-tools",
+    }
+)
+PACKAGE_NAMES = MappingProxyType(
+    {
+        tool: MappingProxyType(names)
+        for tool, names in {
+            "ninja": {
+                "apt": "ninja-build",
+                "dnf": "ninja-build",
+                "brew": "ninja",
+                "choco": "ninja",
+            },
+            "cmake": {
+                "apt": "cmake",
+                "dnf": "cmake",
+                "brew": "cmake",
+                "choco": "cmake",
+            },
+            "qtcreator": {
+                "apt": "qtcreator",
+                "dnf": "qt-creator",
+                "brew": "qt-creator",
+                "choco": "qtcreator",
+            },
+            "qt": {
+                "apt": "qt6-base-dev qt6-declarative-dev",
+                "dnf": "qt6-qtbase-devel qt6-qtdeclarative-devel",
+                "brew": "qt@6",
+                "choco": "qt-lts-long-term-release",
+            },
+        }.items()
+    }
+)
 QML_EXCLUDE_DIRS = {".git", ".idea", ".vscode", "__pycache__", "build", "third_party"}
+BUILD_SEARCH_SKIP_DIRS = {"CMakeFiles", ".cmake", "_deps"}
+# Skipped when checking CMake inputs for changes (dot-dirs are always skipped).
+CMAKE_INPUT_SKIP_DIRS = {"__pycache__", "build", "qt6", "qtcreator"}
+DEV_TOOL_CACHE_DIR = ROOT / ".dev_tool_cache"
+QML_INDEX_CACHE_FILE = DEV_TOOL_CACHE_DIR / "qml_index.json"
+QML_INDEX_CACHE_VERSION = 1
+TARGETS_CACHE_FILE = DEV_TOOL_CACHE_DIR / "targets.json"
 DEFAULT_QT_CREATOR_OUTPUT_DIR = ROOT / "third_party" / "qtcreator"
 QT_CREATOR_EXECUTABLE_NAMES = ["qtcreator.exe", "qtcreator", "Qt Creator"]
 
 CONFIG_DIR_NAME = "CPlusPlusQT6Skel"
 CONFIG_FILE_NAME = "settings.json"
+NET_CACHE_FILE_NAME = "net_cache.json"
+NET_CACHE_TTL_SECONDS = 6 * 60 * 60
+DETECT_CACHE_FILE_NAME = "detect_cache.json"
 DEFAULT_SETTINGS = {
     "build_dir": str(DEFAULT_BUILD_DIR),
     "build_type": DEFAULT_BUILD_TYPE,
@@ -1,27 +1,93 @@
+import functools
+import itertools
 import os
-import shutil
-import subprocess
+import re
+from collections import deque
+from dataclasses import dataclass
 from pathlib import Path
-from typing import Iterable, Optional, Sequence
+from typing import Callable, Iterable, Optional, Sequence
 
-from .config import default_run_targets
-from .constants import NON_RUN_TARGETS, ROOT
-from .utils import prompt_yes_no, run_command
+from .config import _path_resolve, default_run_targets, json_dumps, json_loads
+from .constants import (
+    BUILD_SEARCH_SKIP_DIRS,
+    CMAKE_INPUT_SKIP_DIRS,
+    NON_RUN_TARGETS,
+    ROOT,
+    TARGETS_CACHE_FILE,
+)
+from .qt import detect_generator
+from .utils import _first_existing, _which, capture_output, prompt_yes_no, run_command
 
 
-def is_multi_config(generator: Optional[str], build_dir: Path) -> bool:
-    if generator and (
-        "Visual Studio" in generator
-        or "Xcode" in generator
-        or "Multi-Config" in generator
-    ):
-        return True
+# KEY[:TYPE]=VALUE on lines that are not // or # comments.
+_CMAKE_CACHE_ENTRY_RE = re.compile(r"^(?!//|#)([^:=\n]*)[^=\n]*=(.*)$", re.MULTILINE)
+
+
+@functools.lru_cache(maxsize=8)
+def _parse_cmake_cache(path: str, mtime_ns: int, size: int) -> dict[str, str]:
+    """Parse KEY:TYPE=VALUE entries; mtime/size are part of the cache key only."""
+    with open(path, encoding="utf-8", errors="ignore") as handle:
+        text = handle.read()
+    # One C-level scan over the whole file instead of a Python loop per line.
+    return {name: value.strip() for name, value in _CMAKE_CACHE_ENTRY_RE.findall(text)}
+
+
+def read_cmake_cache(build_dir: Path) -> dict[str, str]:
+    """Return CMakeCache.txt variables for build_dir ({} when not configured)."""
     cache = build_dir / "CMakeCache.txt"
-    if cache.exists():
-        text = cache.read_text(encoding="utf-8", errors="ignore")
-        if "CMAKE_CONFIGURATION_TYPES" in text:
+    try:
+        stat = cache.stat()
+    except OSError:
+        return {}
+    return _parse_cmake_cache(str(cache), stat.st_mtime_ns, stat.st_size)
+
+
+_MULTI_CONFIG_GENERATOR_RE = re.compile(r"Visual Studio|Xcode|Multi-Config")
+
+
+def _generator_is_multi_config(generator: Optional[str]) -> bool:
+    return bool(generator and _MULTI_CONFIG_GENERATOR_RE.search(generator))
+
+
+@dataclass(frozen=True)
+class CMakeCache:
+    """Parsed CMakeCache.txt of one build dir, read once and shared by callers."""
+
+    build_dir: Path
+    entries: dict[str, str]
+
+    @classmethod
+    def from_build_dir(cls, build_dir: Path) -> "CMakeCache":
+        return cls(build_dir, read_cmake_cache(build_dir))
+
+    @property
+    def generator(self) -> Optional[str]:
+        return self.entries.get("CMAKE_GENERATOR") or None
+
+    @property
+    def configuration_types(self) -> list[str]:
+        value = self.entries.get("CMAKE_CONFIGURATION_TYPES", "")
+        return [part for part in value.split(";") if part]
+
+    def is_multi_config(self, generator: Optional[str] = None) -> bool:
+        if _generator_is_multi_config(generator):
             return True
-    return False
+        return "CMAKE_CONFIGURATION_TYPES" in self.entries
+
+    def build_config(
+        self,
+        generator: Optional[str],
+        build_type: str,
+        config_override: Optional[str],
+    ) -> Optional[str]:
+        """The --config value to pass: explicit override, else build_type when multi-config."""
+        return config_override or (build_type if self.is_multi_config(generator) else None)
+
+
+def is_multi_config(generator: Optional[str], build_dir: Path) -> bool:
+    if _generator_is_multi_config(generator):
+        return True
+    return CMakeCache.from_build_dir(build_dir).is_multi_config()
 
 
 def _clear_build_dir(build_dir: Path) -> None:
@@ -29,6 +95,8 @@ def _clear_build_dir(build_dir: Path) -> None:
     if not build_dir.exists():
         return
     print(f"Clearing existing build directory: {build_dir}")
+    import shutil
+
     shutil.rmtree(build_dir)
 
 
@@ -76,6 +144,82 @@ def _resolve_generator_for_build_dir(
     return requested_generator
 
 
+# Set once the Ninja fallback note has been printed; clear it to print it again.
+_MAKE_FALLBACK_WARNED = False
+
+
+def _warn_make_fallback() -> None:
+    """Print the Ninja fallback note once per process (menu loops configure repeatedly)."""
+    global _MAKE_FALLBACK_WARNED
+    if _MAKE_FALLBACK_WARNED:
+        return
+    _MAKE_FALLBACK_WARNED = True
+    print("Ninja not found; letting CMake pick its default generator (usually Makefiles).")
+
+
+def _newest_cmake_input_mtime(root: Path, build_dir: Path) -> int:
+    """Newest mtime_ns among CMakeLists.txt / *.cmake files under root."""
+    newest = 0
+    build_dir_str = str(build_dir)
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames[:] = [
+            name
+            for name in dirnames
+            if not name.startswith(".")
+            and name not in CMAKE_INPUT_SKIP_DIRS
+            and os.path.join(dirpath, name) != build_dir_str
+        ]
+        for filename in filenames:
+            if filename == "CMakeLists.txt" or filename.endswith(".cmake"):
+                try:
+                    mtime_ns = os.stat(os.path.join(dirpath, filename)).st_mtime_ns
+                except OSError:
+                    continue
+                newest = max(newest, mtime_ns)
+    return newest
+
+
+def _generated_build_files(generator: Optional[str]) -> list[str]:
+    """Files (relative to the build dir) only a successful generate step leaves behind."""
+    files = ["CMakeFiles/cmake.check_cache"]
+    if generator and "Ninja" in generator:
+        files.append("build.ninja")
+    elif generator and "Makefiles" in generator:
+        files.append("Makefile")
+    return files
+
+
+def _needs_configure(
+    build_dir: Path,
+    generator: Optional[str],
+    build_type: str,
+    qt_prefix: Optional[Path],
+) -> bool:
+    """
+    True unless build_dir holds a cache configured with the same generator,
+    build type and Qt prefix that is newer than every CMake input file, and
+    the generated build system is in place. CMake writes CMakeCache.txt even
+    when configure fails, so the cache alone does not mean it finished.
+    """
+    entries = read_cmake_cache(build_dir)
+    if not entries:
+        return True
+    if generator and entries.get("CMAKE_GENERATOR") != generator:
+        return True
+    if build_type and entries.get("CMAKE_BUILD_TYPE") != build_type:
+        return True
+    if qt_prefix and entries.get("CMAKE_PREFIX_PATH") != str(qt_prefix):
+        return True
+    try:
+        cache_mtime_ns = (build_dir / "CMakeCache.txt").stat().st_mtime_ns
+        for generated in _generated_build_files(entries.get("CMAKE_GENERATOR")):
+            if (build_dir / generated).stat().st_mtime_ns < cache_mtime_ns:
+                return True
+    except OSError:
+        return True
+    return _newest_cmake_input_mtime(ROOT, build_dir) >= cache_mtime_ns
+
+
 def configure_project(
     build_dir: Path,
     generator: Optional[str],
@@ -83,6 +227,7 @@ def configure_project(
     qt_prefix: Optional[Path],
     *,
     generator_is_strict: bool = False,
+    force: bool = False,
 ) -> Optional[str]:
     if build_dir.exists() and not build_dir.is_dir():
         raise SystemExit(f"Build path exists and is not a directory: {build_dir}")
@@ -90,6 +235,15 @@ def configure_project(
     generator = _resolve_generator_for_build_dir(
         build_dir, generator, generator_is_strict=generator_is_strict
     )
+    # Always hand CMake a concrete generator so it never silently falls back
+    # to Makefiles when Ninja is on PATH.
+    generator = generator or detect_generator(None)
+    if not generator:
+        _warn_make_fallback()
+
+    if not force and not _needs_configure(build_dir, generator, build_type, qt_prefix):
+        print(f"CMake cache in {build_dir} is up to date; skipping configure.")
+        return generator
 
     build_dir.mkdir(parents=True, exist_ok=True)
 
@@ -105,21 +259,49 @@ def configure_project(
     return generator
 
 
+def _build_parallel_level(generator: Optional[str], jobs: Optional[int]) -> Optional[int]:
+    """
+    Job count for ``cmake --build --parallel``, or None to leave it to the build tool.
+
+    An explicit ``--jobs`` wins. Otherwise a CMAKE_BUILD_PARALLEL_LEVEL already in the
+    environment is honored by CMake itself (re-passing it from a nested superbuild would
+    multiply job counts), Ninja runs one job per core on its own, and Visual Studio /
+    Xcode schedule their own builds. Only Make-style generators, which build serially
+    by default, get one job per CPU.
+    """
+    env_level = os.environ.get("CMAKE_BUILD_PARALLEL_LEVEL")
+    if jobs:
+        if env_level:
+            print(f"--jobs {jobs} overrides CMAKE_BUILD_PARALLEL_LEVEL={env_level} from the environment.")
+        return jobs
+    if env_level:
+        return None
+    if generator and ("Ninja" in generator or _generator_is_multi_config(generator)):
+        return None
+    return os.cpu_count() or 1
+
+
 def build_targets(
     build_dir: Path,
     generator: Optional[str],
     build_type: str,
     targets: Sequence[str],
     config_override: Optional[str],
+    *,
+    cache: Optional[CMakeCache] = None,
+    jobs: Optional[int] = None,
 ) -> None:
-    multi = is_multi_config(generator, build_dir)
-    config = config_override or (build_type if multi else None)
+    cache = cache or CMakeCache.from_build_dir(build_dir)
+    config = cache.build_config(generator, build_type, config_override)
 
     cmd: list[str] = ["cmake", "--build", str(build_dir)]
     if targets:
         cmd += ["--target", *targets]
     if config:
         cmd += ["--config", config]
+    parallel = _build_parallel_level(generator or cache.generator, jobs)
+    if parallel:
+        cmd += ["--parallel", str(parallel)]
 
     run_command(cmd)
 
@@ -130,9 +312,11 @@ def run_tests(
     build_type: str,
     config_override: Optional[str],
     extra_ctest: Sequence[str],
+    *,
+    cache: Optional[CMakeCache] = None,
 ) -> None:
-    multi = is_multi_config(generator, build_dir)
-    config = config_override or (build_type if multi else None)
+    cache = cache or CMakeCache.from_build_dir(build_dir)
+    config = cache.build_config(generator, build_type, config_override)
 
     cmd: list[str] = ["ctest", "--test-dir", str(build_dir)]
     if config:
@@ -142,16 +326,63 @@ def run_tests(
     run_command(cmd)
 
 
+def _find_first_file(root: Path, name: str) -> Optional[Path]:
+    """Breadth-first search for the shallowest file called name, skipping CMake internals."""
+    queue: deque[str] = deque([str(root)])
+    while queue:
+        directory = queue.popleft()
+        try:
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    if entry.is_dir(follow_symlinks=False):
+                        if entry.name not in BUILD_SEARCH_SKIP_DIRS:
+                            queue.append(entry.path)
+                    elif entry.name == name and entry.is_file():
+                        return Path(entry.path)
+        except OSError:
+            continue
+    return None
+
+
+# Output argument of a link.txt command line: "-o path" (GCC/Clang) or "/out:path" (MSVC).
+_LINK_OUTPUT_RE = re.compile(r"(?:^|\s)(?:-o\s+|[/-]out:)(\"[^\"]+\"|\S+)", re.IGNORECASE)
+
+# (build dir, target, config) -> executable found earlier in this process.
+_BUILT_BINARY_CACHE: dict[tuple[str, str, Optional[str]], Path] = {}
+
+
+def _link_output_path(build_dir: Path, target: str) -> Optional[Path]:
+    """Executable named by the Makefile generators' CMakeFiles/<target>.dir/link.txt."""
+    try:
+        text = (build_dir / "CMakeFiles" / f"{target}.dir" / "link.txt").read_text(
+            errors="replace"
+        )
+    except OSError:
+        return None
+    match = _LINK_OUTPUT_RE.search(text)
+    if not match:
+        return None
+    output = build_dir / match.group(1).strip('"')
+    return output if output.is_file() else None
+
+
 def find_built_binary(
     build_dir: Path,
     target: str,
     generator: Optional[str],
     build_type: str,
     config_override: Optional[str],
+    *,
+    cache: Optional[CMakeCache] = None,
 ) -> Path:
     exe_name = target + (".exe" if os.name == "nt" else "")
-    multi = is_multi_config(generator, build_dir)
-    config = config_override or (build_type if multi else None)
+    cache = cache or CMakeCache.from_build_dir(build_dir)
+    config = cache.build_config(generator, build_type, config_override)
+
+    key = (str(build_dir), target, config)
+    known = _BUILT_BINARY_CACHE.get(key)
+    if known and known.is_file():
+        return known
 
     candidates = [
         build_dir / exe_name,
@@ -161,65 +392,128 @@ def find_built_binary(
         candidates.append(build_dir / config / exe_name)
         candidates.append(build_dir / config / target / exe_name)
 
-    for candidate in candidates:
-        if candidate.exists():
-            return candidate
-
-    matches = list(build_dir.rglob(exe_name))
-    if matches:
-        return matches[0]
+    found = (
+        _first_existing(candidates)
+        or _link_output_path(build_dir, target)
+        or _find_first_file(build_dir, exe_name)
+    )
+    if found:
+        _BUILT_BINARY_CACHE[key] = found
+        return found
 
     raise FileNotFoundError(f"Executable for target '{target}' not found in {build_dir}")
 
 
 def read_generator_from_cache(build_dir: Path) -> Optional[str]:
-    cache = build_dir / "CMakeCache.txt"
-    if not cache.exists():
-        return None
-    for line in cache.read_text(encoding="utf-8", errors="ignore").splitlines():
-        if line.startswith("CMAKE_GENERATOR:INTERNAL="):
-            return line.partition("=")[2].strip()
-    return None
+    return CMakeCache.from_build_dir(build_dir).generator
 
 
-def list_targets_with_ninja(build_dir: Path) -> list[str]:
-    if not shutil.which("ninja"):
+def _mtime_ns(path: Path) -> int:
+    try:
+        return path.stat().st_mtime_ns
+    except OSError:
+        return 0
+
+
+def _cached_targets(
+    build_dir: Path, label: str, compute: Callable[[], list[str]]
+) -> list[str]:
+    """
+    Return target names for build_dir from .dev_tool_cache/targets.json, or
+    compute and store them. Entries are valid while CMakeCache.txt and
+    build.ninja keep the mtimes they had when the list was produced.
+    """
+    slot = f"{_path_resolve(build_dir)}|{label}"
+    stamp = [_mtime_ns(build_dir / "CMakeCache.txt"), _mtime_ns(build_dir / "build.ninja")]
+    try:
+        entries = json_loads(TARGETS_CACHE_FILE.read_bytes())
+        if not isinstance(entries, dict):
+            entries = {}
+    except Exception:
+        entries = {}
+
+    hit = entries.get(slot)
+    if isinstance(hit, dict) and hit.get("key") == stamp and stamp[0]:
+        return list(hit.get("targets", []))
+
+    targets = compute()
+    if targets and stamp[0]:
+        entries[slot] = {"key": stamp, "targets": targets}
+        try:
+            TARGETS_CACHE_FILE.parent.mkdir(parents=True, exist_ok=True)
+            TARGETS_CACHE_FILE.write_bytes(json_dumps(entries))
+        except OSError:
+            pass
+    return targets
+
+
+# `ninja -t targets`: "name: rule".
+_NINJA_TARGET_RE = re.compile(r"^[ \t]*([^:\r\n]+?)[ \t]*(?::|\r?$)", re.MULTILINE)
+# `cmake --build --target help`: "... name (note)" (Makefiles) or "name: rule" (Ninja).
+_CMAKE_HELP_TARGET_RE = re.compile(
+    r"^(?:\.\.\.[ \t]*([^ \t\r\n]+)|[ \t]*([^:\r\n]+?)[ \t]*:)", re.MULTILINE
+)
+
+# CMakeFiles/TargetDirectories.txt: one "<bin dir>/CMakeFiles/<name>.dir" per target.
+_TARGET_DIRECTORY_RE = re.compile(r"CMakeFiles[\\/](.+?)\.dir[ \t]*\r?$", re.MULTILINE)
+
+
+def _filter_targets(names: Iterable[str]) -> list[str]:
+    """Drop non-runnable targets and duplicates, keeping first-seen order."""
+    return [name for name in dict.fromkeys(names) if name not in NON_RUN_TARGETS]
+
+
+def _ninja_targets(build_dir: Path) -> list[str]:
+    if not _which("ninja"):
         return []
+    import subprocess
+
     try:
-        output = subprocess.check_output(
+        output = capture_output(
             ["ninja", "-C", str(build_dir), "-t", "targets", "all"],
             text=True,
         )
     except subprocess.CalledProcessError:
         return []
-    targets: list[str] = []
-    for line in output.splitlines():
-        name = line.split(":", 1)[0].strip()
-        if name and name not in NON_RUN_TARGETS:
-            targets.append(name)
-    return targets
+    return _filter_targets(m.group(1) for m in _NINJA_TARGET_RE.finditer(output))
 
 
-def list_targets_with_cmake(build_dir: Path, config: Optional[str]) -> list[str]:
+def _cmake_help_targets(build_dir: Path, config: Optional[str]) -> list[str]:
     cmd = ["cmake", "--build", str(build_dir), "--target", "help"]
     if config:
         cmd += ["--config", config]
+    import subprocess
+
     try:
-        output = subprocess.check_output(cmd, text=True)
+        output = capture_output(cmd, text=True)
     except subprocess.CalledProcessError:
         return []
 
-    targets: list[str] = []
-    for line in output.splitlines():
-        if line.startswith("..."):
-            candidate = line[3:].strip().split(" ")[0]
-        elif ":" in line:
-            candidate = line.split(":", 1)[0].strip()
-        else:
-            continue
-        if candidate and candidate not in NON_RUN_TARGETS:
-            targets.append(candidate)
-    return targets
+    return _filter_targets(
+        m.group(1) or m.group(2) for m in _CMAKE_HELP_TARGET_RE.finditer(output)
+    )
+
+
+def _target_directory_targets(build_dir: Path) -> list[str]:
+    """Targets CMake recorded at generate time; no build tool process needed."""
+    try:
+        text = (build_dir / "CMakeFiles" / "TargetDirectories.txt").read_text(errors="replace")
+    except OSError:
+        return []
+    return _filter_targets(m.group(1) for m in _TARGET_DIRECTORY_RE.finditer(text))
+
+
+def list_targets_with_ninja(build_dir: Path) -> list[str]:
+    return _cached_targets(build_dir, "ninja", lambda: _ninja_targets(build_dir))
+
+
+def list_targets_with_cmake(build_dir: Path, config: Optional[str]) -> list[str]:
+    targets = _target_directory_targets(build_dir)
+    if targets:
+        return targets
+    return _cached_targets(
+        build_dir, f"cmake:{config or ''}", lambda: _cmake_help_targets(build_dir, config)
+    )
 
 
 def list_runnable_targets(
@@ -227,20 +521,16 @@ def list_runnable_targets(
     generator: Optional[str],
     build_type: str,
     config_override: Optional[str],
+    *,
+    cache: Optional[CMakeCache] = None,
 ) -> list[str]:
-    gen = generator or read_generator_from_cache(build_dir) or ""
-    config = config_override or (build_type if is_multi_config(gen, build_dir) else None)
+    cache = cache or CMakeCache.from_build_dir(build_dir)
+    gen = generator or cache.generator or ""
+    config = cache.build_config(gen, build_type, config_override)
 
     if "Ninja" in gen:
         found = list_targets_with_ninja(build_dir)
     else:
         found = list_targets_with_cmake(build_dir, config)
 
-    seen = set()
-    cleaned: list[str] = []
-    for name in found + default_run_targets():
-        if name in NON_RUN_TARGETS or name in seen:
-            continue
-        seen.add(name)
-        cleaned.append(name)
-    return cleaned
+    return _filter_targets(itertools.chain(found, default_run_targets()))
@@ -1,32 +1,97 @@
 import os
-import shutil
 import sys
 from pathlib import Path
 from typing import Optional
 
+from .config import json_dumps, json_loads
 from .constants import (
     DEFAULT_QT_CREATOR_OUTPUT_DIR,
     HELP_URLS,
-    QT_CREATOR_EXECUTABLE_NAMES,
     QML_EXCLUDE_DIRS,
+    QML_INDEX_CACHE_FILE,
+    QML_INDEX_CACHE_VERSION,
+    QT_CREATOR_EXECUTABLE_NAMES,
     ROOT,
 )
-from .utils import prompt_for_choice, run_command
+from .utils import _first_existing, _which, prompt_for_choice, run_command
+
+
+def _load_qml_cache(root: Path) -> dict[str, list]:
+    """Return cached {dirpath: [mtime_ns, subdirs, qml_names]} for root, or {}."""
+    try:
+        data = json_loads(QML_INDEX_CACHE_FILE.read_bytes())
+    except Exception:
+        return {}
+    if (
+        not isinstance(data, dict)
+        or data.get("version") != QML_INDEX_CACHE_VERSION
+        or data.get("root") != str(root)
+        or not isinstance(data.get("dirs"), dict)
+    ):
+        return {}
+    return data["dirs"]
+
+
+def _save_qml_cache(root: Path, dirs: dict[str, list]) -> None:
+    payload = {"version": QML_INDEX_CACHE_VERSION, "root": str(root), "dirs": dirs}
+    try:
+        QML_INDEX_CACHE_FILE.parent.mkdir(parents=True, exist_ok=True)
+        QML_INDEX_CACHE_FILE.write_bytes(json_dumps(payload))
+    except OSError:
+        pass
+
+
+QML_SUFFIX = ".qml"
+
+
+def _scan_qml_dir(dirpath: str) -> tuple[list[str], list[str]]:
+    """List (subdirs to descend, .qml filenames) for one directory."""
+    subdirs: list[str] = []
+    qml_names: list[str] = []
+    with os.scandir(dirpath) as entries:
+        for entry in entries:
+            if entry.is_dir(follow_symlinks=False):
+                if entry.name not in QML_EXCLUDE_DIRS and not entry.name.startswith("."):
+                    subdirs.append(entry.name)
+            # Lowercase only the 4-char tail, not every (mostly non-QML) filename.
+            elif entry.name[-4:].lower() == QML_SUFFIX:
+                qml_names.append(entry.name)
+    return subdirs, qml_names
 
 
 def find_qml_files(root: Path) -> list[Path]:
     """
     Locate QML files under the project while skipping generated/vendor trees.
     Avoids crawling heavy third_party/build directories to keep menus snappy.
+    Directory listings are cached on disk and only re-read for directories
+    whose mtime changed (i.e. entries were added, removed, or renamed).
     """
+    cached = _load_qml_cache(root)
+    fresh: dict[str, list] = {}
     qml_files: list[Path] = []
-    for dirpath, dirnames, filenames in os.walk(root):
-        dirnames[:] = [
-            d for d in dirnames if d not in QML_EXCLUDE_DIRS and not d.startswith(".")
-        ]
-        for filename in filenames:
-            if filename.lower().endswith(".qml"):
-                qml_files.append(Path(dirpath) / filename)
+    stack = [str(root)]
+    while stack:
+        dirpath = stack.pop()
+        try:
+            mtime_ns = os.stat(dirpath).st_mtime_ns
+        except OSError:
+            continue
+        entry = cached.get(dirpath)
+        if entry and entry[0] == mtime_ns:
+            subdirs, qml_names = entry[1], entry[2]
+        else:
+            try:
+                subdirs, qml_names = _scan_qml_dir(dirpath)
+            except OSError:
+                continue
+        fresh[dirpath] = [mtime_ns, subdirs, qml_names]
+        if qml_names:
+            base = Path(dirpath)
+            qml_files.extend(base / name for name in qml_names)
+        stack.extend(os.path.join(dirpath, name) for name in subdirs)
+
+    if fresh != cached:
+        _save_qml_cache(root, fresh)
     return sorted(qml_files, key=lambda p: p.relative_to(root))
 
 
@@ -41,14 +106,24 @@ def _ensure_aqt() -> None:
 
 
 def _find_qt_creator_in_tree(root: Path) -> Optional[Path]:
-    """Return the first Qt Creator executable found inside the provided directory."""
+    """
+    Return the Qt Creator executable inside the provided directory, preferring
+    names listed earlier in QT_CREATOR_EXECUTABLE_NAMES.
+    """
     if not root or not root.exists():
         return None
-    for name in QT_CREATOR_EXECUTABLE_NAMES:
-        for candidate in root.rglob(name):
-            if candidate.is_file():
-                return candidate
-    return None
+    # One walk for all executable names instead of an rglob per name; keep the
+    # first match per name and pick by name priority afterwards.
+    found: dict[str, Path] = {}
+    for dirpath, _, filenames in os.walk(root):
+        for filename in filenames:
+            if filename in QT_CREATOR_EXECUTABLE_NAMES and filename not in found:
+                candidate = Path(dirpath) / filename
+                if candidate.is_file():
+                    found[filename] = candidate
+        if QT_CREATOR_EXECUTABLE_NAMES[0] in found:
+            break
+    return next((found[name] for name in QT_CREATOR_EXECUTABLE_NAMES if name in found), None)
 
 
 def download_qt_creator(version: Optional[str], output_dir: Path) -> Path:
@@ -105,15 +180,14 @@ def locate_qt_creator(
             continue
         candidate = Path(value)
         if candidate.is_dir():
-            for name in QT_CREATOR_EXECUTABLE_NAMES:
-                exe = candidate / name
-                if exe.exists():
-                    return exe
+            exe = _first_existing(candidate / name for name in QT_CREATOR_EXECUTABLE_NAMES)
+            if exe:
+                return exe
         if candidate.exists():
             return candidate
 
     for name in QT_CREATOR_EXECUTABLE_NAMES:
-        found = shutil.which(name)
+        found = _which(name)
         if found:
             return Path(found)
 
@@ -146,9 +220,9 @@ def locate_qt_creator(
             Path("/usr/local/bin/qtcreator"),
         ]
 
-    for candidate in common_paths:
-        if candidate.exists():
-            return candidate
+    found = _first_existing(common_paths)
+    if found:
+        return found
     if allow_download:
         return download_qt_creator(download_version, download_output_dir)
     return None
@@ -176,15 +250,24 @@ def find_qml2puppet(creator_exe: Path) -> Optional[Path]:
         creator_exe.parent.parent,
         creator_exe.parent.parent.parent,
     ]
-    names = ["qml2puppet.exe", "qml2puppet"]
+    names = ("qml2puppet.exe", "qml2puppet")
     for root in search_roots:
+        # One directory read per root covers the exact names and the glob fallback.
+        try:
+            with os.scandir(root) as entries:
+                puppets = {
+                    entry.name: entry
+                    for entry in entries
+                    if entry.name.startswith("qml2puppet")
+                }
+        except OSError:
+            continue
         for name in names:
-            candidate = root / name
-            if candidate.exists():
-                return candidate
-        for candidate in root.glob("qml2puppet*"):
-            if candidate.is_file():
-                return candidate
+            if name in puppets:
+                return root / name
+        for entry in puppets.values():
+            if entry.is_file():
+                return root / entry.name
     return None
 
 
@@ -1,21 +1,30 @@
 import argparse
+import functools
 import json
 import os
 import re
-import shutil
-import subprocess
 import sys
+from collections import deque
 from pathlib import Path
-from typing import Iterable, List, Optional, Sequence, Tuple
+from typing import Iterable, Iterator, List, Optional, Sequence
 
+from .config import (
+    _detection_cache_get,
+    _detection_cache_put,
+    json_loads,
+)
 from .constants import (
+    BUILD_SEARCH_SKIP_DIRS,
     DEFAULT_QT_CREATOR_OUTPUT_DIR,
     HELP_URLS,
     PACKAGE_NAMES,
+    QML_EXCLUDE_DIRS,
     QT_CREATOR_EXECUTABLE_NAMES,
     ROOT,
 )
 from .utils import (
+    _which,
+    capture_output,
     compare_versions,
     fetch_latest_pdcurses_version,
     fetch_latest_qt_version,
@@ -25,16 +34,21 @@ from .utils import (
 )
 
 
+QT_FLAVOR_TOKENS = ("mingw", "msvc")
+
+
 def detect_qt_flavor(path: Path) -> Optional[str]:
     """Return 'mingw' or 'msvc' based on path segments (Windows-only heuristic)."""
-    lower_parts = [part.lower() for part in path.parts]
-    if any("mingw" in part for part in lower_parts):
-        return "mingw"
-    if any("msvc" in part for part in lower_parts):
-        return "msvc"
+    # Tokens never contain a separator, so one substring test over the whole
+    # lowercased path matches exactly the per-segment scan.
+    lowered = str(path).lower()
+    for flavor in QT_FLAVOR_TOKENS:
+        if flavor in lowered:
+            return flavor
     return None
 
 
+@functools.lru_cache(maxsize=1)
 def _vswhere_path() -> Optional[Path]:
     """Return vswhere.exe if present in the standard Visual Studio installer dir."""
     program_files_x86 = os.environ.get("ProgramFiles(x86)")
@@ -69,9 +83,11 @@ def _maybe_warn_missing_vswhere() -> None:
     print(_vswhere_install_help())
 
 
+@functools.lru_cache(maxsize=1)
 def _vswhere_info() -> Optional[tuple[Optional[str], Optional[str]]]:
     """
     Return (installationPath, installationVersion) for the latest Visual Studio.
+    This is the only vswhere.exe invocation; other VS probes derive from it.
     """
     if not sys.platform.startswith("win"):
         return None
@@ -91,13 +107,15 @@ def _vswhere_info() -> Optional[tuple[Optional[str], Optional[str]]]:
         "-format",
         "json",
     ]
+    import subprocess
+
     try:
-        output = subprocess.check_output(cmd, text=True, encoding="utf-8").strip()
+        output = capture_output(cmd).strip()
     except (subprocess.CalledProcessError, FileNotFoundError):
         return None
 
     try:
-        data = json.loads(output)
+        data = json_loads(output)
     except json.JSONDecodeError:
         return None
 
@@ -110,6 +128,7 @@ def _vswhere_info() -> Optional[tuple[Optional[str], Optional[str]]]:
     return install_path, install_version
 
 
+@functools.lru_cache(maxsize=1)
 def _has_visual_studio_install() -> bool:
     """
     Detect a Visual Studio toolchain even when cl.exe is not on PATH.
@@ -118,28 +137,11 @@ def _has_visual_studio_install() -> bool:
     if any(os.environ.get(var) for var in ("VCToolsInstallDir", "VCINSTALLDIR", "VSINSTALLDIR")):
         return True
 
-    vswhere = _vswhere_path()
-    if not vswhere:
-        _maybe_warn_missing_vswhere()
-        return False
-
-    cmd = [
-        str(vswhere),
-        "-latest",
-        "-products",
-        "*",
-        "-requires",
-        "Microsoft.Component.MSBuild",
-        "-property",
-        "installationVersion",
-    ]
-    try:
-        output = subprocess.check_output(cmd, text=True, encoding="utf-8").strip()
-    except (subprocess.CalledProcessError, FileNotFoundError):
-        return False
-    return bool(output)
+    info = _vswhere_info()
+    return bool(info and info[1])
 
 
+@functools.lru_cache(maxsize=1)
 def _detect_visual_studio_generator() -> Optional[str]:
     """
     Return a Visual Studio generator string (e.g., "Visual Studio 17 2022")
@@ -167,22 +169,63 @@ def _detect_visual_studio_generator() -> Optional[str]:
     return None
 
 
+def clear_toolchain_caches() -> None:
+    """
+    Forget memoized toolchain lookups (vswhere, compiler flavor, library dirs,
+    default generator, package manager, PATH lookups, Qt prefix).
+    Long-lived callers (e.g. an interactive menu) should call this after the
+    environment changes so the next lookup probes the toolchain again.
+    """
+    for cached in (
+        _vswhere_path,
+        _vswhere_info,
+        _has_visual_studio_install,
+        _detect_visual_studio_generator,
+        _detect_compiler_flavor,
+        _compiler_search_dirs_cached,
+        _msvc_library_dirs_cached,
+        _detect_default_generator,
+        detect_package_manager,
+        package_install_hint,
+        _which,
+        _resolve_qt_prefix_cached,
+    ):
+        cached.cache_clear()
+
+
 def detect_compiler_flavor(generator: Optional[str]) -> Optional[str]:
     """
     Best-effort guess of Windows toolchain flavor so we can match Qt binaries.
     Returns "msvc", "mingw", or None when unsure/not Windows.
+    Results are cached per process for the same generator and compiler env vars.
     """
-    if not sys.platform.startswith("win"):
+    return _detect_compiler_flavor(
+        generator,
+        sys.platform,
+        os.environ.get("CXX"),
+        os.environ.get("CC"),
+        os.environ.get("CMAKE_GENERATOR"),
+    )
+
+
+@functools.lru_cache(maxsize=None)
+def _detect_compiler_flavor(
+    generator: Optional[str],
+    platform: str,
+    cxx: Optional[str],
+    cc: Optional[str],
+    env_generator: Optional[str],
+) -> Optional[str]:
+    if not platform.startswith("win"):
         return None
 
-    gen = (generator or os.environ.get("CMAKE_GENERATOR") or "").lower()
+    gen = (generator or env_generator or "").lower()
     if "visual studio" in gen or "msvc" in gen:
         return "msvc"
     if "mingw" in gen:
         return "mingw"
 
-    for env_var in ("CXX", "CC"):
-        compiler = os.environ.get(env_var)
+    for compiler in (cxx, cc):
         if not compiler:
             continue
         name = Path(compiler).name.lower()
@@ -194,10 +237,10 @@ def detect_compiler_flavor(generator: Optional[str]) -> Optional[str]:
     if _has_visual_studio_install():
         return "msvc"
 
-    cl_path = shutil.which("cl")
+    cl_path = _which("cl")
     if cl_path:
         return "msvc"
-    gxx_path = shutil.which("g++")
+    gxx_path = _which("g++")
     if gxx_path:
         return "mingw"
     return None
@@ -221,50 +264,71 @@ def compiler_install_hint() -> str:
 def _compiler_search_dirs(compiler: str) -> list[Path]:
     """Best-effort search dirs via `<compiler> -print-search-dirs` (gcc/clang style)."""
     try:
-        output = subprocess.check_output(
-            [compiler, "-print-search-dirs"], text=True, encoding="utf-8"
-        )
+        mtime_ns = os.stat(compiler).st_mtime_ns
+    except OSError:
+        mtime_ns = None
+    return list(_compiler_search_dirs_cached(compiler, mtime_ns))
+
+
+@functools.lru_cache(maxsize=16)
+def _compiler_search_dirs_cached(compiler: str, mtime_ns: Optional[int]) -> tuple[Path, ...]:
+    """Run the compiler once per (path, mtime); a rebuilt/replaced binary is re-queried."""
+    import subprocess
+
+    try:
+        output = capture_output([compiler, "-print-search-dirs"], text=True, encoding="utf-8")
     except (subprocess.CalledProcessError, FileNotFoundError, OSError):
-        return []
+        return ()
     for line in output.splitlines():
         if line.lower().startswith("libraries:"):
             _, _, path_list = line.partition("=")
-            return [
+            return tuple(
                 Path(p).resolve()
                 for p in path_list.strip().split(os.pathsep)
                 if p.strip()
-            ]
-    return []
+            )
+    return ()
 
 
 def _unique_existing_paths(paths: Iterable[Path]) -> list[Path]:
-    seen: set[Path] = set()
+    """Drop missing paths and duplicates (including symlinked aliases) with one stat each."""
+    seen: set[tuple[int, int]] = set()
     result: list[Path] = []
     for path in paths:
-        resolved = path.resolve()
-        if resolved in seen or not resolved.exists():
+        try:
+            st = os.stat(path)
+        except OSError:
+            continue
+        key = (st.st_dev, st.st_ino)
+        if key in seen:
             continue
-        seen.add(resolved)
-        result.append(resolved)
+        seen.add(key)
+        result.append(path)
     return result
 
 
 def _msvc_library_dirs_from_root(root: Path) -> list[Path]:
     """Collect likely MSVC library directories from a VS install or tool root."""
+    return list(_msvc_library_dirs_cached(root))
+
+
+@functools.lru_cache(maxsize=8)
+def _msvc_library_dirs_cached(root: Path) -> tuple[Path, ...]:
     candidates: list[Path] = []
     vc_tools = root / "VC" / "Tools" / "MSVC"
-    if vc_tools.exists():
-        versions = sorted(vc_tools.iterdir(), key=lambda p: p.name)
-        if versions:
-            newest = versions[-1]
-            for sub in (newest / "lib", newest / "lib" / "x64", newest / "lib" / "x86"):
-                candidates.append(sub)
+    try:
+        newest: Optional[Path] = max(vc_tools.iterdir(), key=lambda p: p.name)
+    except (OSError, ValueError):
+        newest = None
+    if newest is not None:
+        for sub in (newest / "lib", newest / "lib" / "x64", newest / "lib" / "x86"):
+            candidates.append(sub)
     for parent in root.parents:
         lib_dir = parent / "lib"
         candidates.append(lib_dir)
         candidates.append(lib_dir / "x64")
         candidates.append(lib_dir / "x86")
-    return _unique_existing_paths(candidates)
+    return tuple(_unique_existing_paths(candidates))
 
 
 def _compiler_library_dirs(compiler_path: Optional[str]) -> list[Path]:
@@ -295,7 +359,7 @@ def detect_compiler(
         compiler = os.environ.get(env_var)
         if not compiler:
             continue
-        resolved = shutil.which(compiler) or (
+        resolved = _which(compiler) or (
             str(Path(compiler)) if Path(compiler).exists() else None
         )
         if resolved:
@@ -304,8 +368,8 @@ def detect_compiler(
 
     if sys.platform.startswith("win"):
         flavor_hint = detect_compiler_flavor(generator)
-        gxx_path = shutil.which("g++")
-        cl_path = shutil.which("cl")
+        gxx_path = _which("g++")
+        cl_path = _which("cl")
         vs_path = _vswhere_path()
 
         def _msvc_result() -> tuple[Optional[str], Optional[str]]:
@@ -344,7 +408,7 @@ def detect_compiler(
         return None, "Install MSVC Build Tools or MinGW-w64 and ensure cl.exe/g++.exe is available.", []
 
     for candidate in ("c++", "g++", "clang++"):
-        path = shutil.which(candidate)
+        path = _which(candidate)
         if path:
             return f"{candidate} at {path}", None, _compiler_library_dirs(path)
 
@@ -399,10 +463,12 @@ def ensure_qt_prefix(
     generator: Optional[str],
 ) -> Optional[Path]:
     """Resolve Qt prefix; optionally auto-download when missing."""
-    def _resolve() -> Optional[Path]:
-        return resolve_qt_prefix(args.qt_prefix, generator)
-
-    qt_prefix = _resolve()
+    qt_prefix = _resolve_qt_prefix_cached(
+        args.qt_prefix,
+        generator,
+        os.environ.get("QT_PREFIX_PATH"),
+        os.environ.get("CMAKE_PREFIX_PATH"),
+    )
     if qt_prefix or not getattr(args, "download_qt_if_missing", False):
         return qt_prefix
 
@@ -417,7 +483,58 @@ def ensure_qt_prefix(
         compiler=compiler_arg,
         output_dir=args.download_qt_output_dir,
     )
-    return _resolve()
+    _resolve_qt_prefix_cached.cache_clear()
+    return resolve_qt_prefix(args.qt_prefix, generator)
+
+
+@functools.lru_cache(maxsize=16)
+def _resolve_qt_prefix_cached(
+    cli_value: Optional[str],
+    generator: Optional[str],
+    qt_prefix_env: Optional[str],
+    cmake_prefix_env: Optional[str],
+) -> Optional[Path]:
+    """resolve_qt_prefix keyed on every input it reads, including the env hints."""
+    return resolve_qt_prefix(cli_value, generator)
+
+
+QT_PREFIX_SEARCH_DEPTH = 4
+# Big subtrees of a Qt install (or its Docs/Examples siblings) that never
+# contain a prefix; skipping them keeps the walk on <version>/<compiler> dirs.
+QT_PREFIX_PRUNE_DIRS = frozenset(
+    {"doc", "Docs", "Examples", "include", "mkspecs", "qml", "plugins", "translations", "libexec"}
+)
+
+
+def _find_qt_prefixes(qt_root: Path, max_depth: int = QT_PREFIX_SEARCH_DEPTH) -> list[Path]:
+    """
+    Breadth-first search for directories containing lib/cmake/Qt6.
+    Qt installs sit at <qt_root>/<version>/<compiler>, so the walk stops at
+    max_depth and never descends into a prefix it already matched.
+    """
+    prefixes: list[Path] = []
+    queue: deque[tuple[Path, int]] = deque([(qt_root, 0)])
+    while queue:
+        directory, depth = queue.popleft()
+        if (directory / "lib" / "cmake" / "Qt6").is_dir():
+            prefixes.append(directory)
+            continue
+        if depth >= max_depth:
+            continue
+        try:
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    if (
+                        entry.name in QML_EXCLUDE_DIRS
+                        or entry.name in QT_PREFIX_PRUNE_DIRS
+                        or entry.name.startswith(".")
+                    ):
+                        continue
+                    if entry.is_dir():
+                        queue.append((Path(entry.path), depth + 1))
+        except OSError:
+            continue
+    return prefixes
 
 
 def autodetect_qt_prefix(preferred_flavor: Optional[str] = None) -> Optional[Path]:
@@ -430,27 +547,29 @@ def autodetect_qt_prefix(preferred_flavor: Optional[str] = None) -> Optional[Pat
     if not qt_root.exists():
         return None
 
-    candidates: list[tuple[Tuple[int, ...], Optional[str], Path]] = []
-    for cmake_dir in qt_root.rglob("lib/cmake/Qt6"):
-        prefix = cmake_dir.parents[2]
-        candidates.append((parse_version_from_path(prefix), detect_qt_flavor(prefix), prefix))
-
-    if not candidates:
-        return None
-
-    def pick_best(items: list[tuple[Tuple[int, ...], Optional[str], Path]]) -> Optional[Path]:
-        if not items:
-            return None
-        items.sort(key=lambda tup: tup[0])
-        return items[-1][2]
+    candidates = (
+        (parse_version_from_path(prefix), detect_qt_flavor(prefix), prefix)
+        for prefix in _find_qt_prefixes(qt_root)
+    )
+    # One pass: a flavor match outranks any version, then the newest version wins.
+    best = max(
+        candidates,
+        key=lambda item: (bool(preferred_flavor) and item[1] == preferred_flavor, item[0]),
+        default=None,
+    )
+    return best[2] if best else None
 
-    if preferred_flavor:
-        matching = [item for item in candidates if item[1] == preferred_flavor]
-        chosen = pick_best(matching)
-        if chosen:
-            return chosen
 
-    return pick_best(candidates)
+def _qt_prefix_candidates(cli_value: Optional[str]) -> Iterator[Optional[str]]:
+    """
+    Yield explicit prefix hints in priority order. Lazy so the common case of
+    an existing CLI/settings prefix never touches the environment.
+    """
+    yield cli_value
+    yield os.environ.get("QT_PREFIX_PATH")
+    cmake_prefixes = os.environ.get("CMAKE_PREFIX_PATH")
+    if cmake_prefixes:
+        yield cmake_prefixes.split(os.pathsep, 1)[0]
 
 
 def resolve_qt_prefix(cli_value: Optional[str], generator: Optional[str] = None) -> Optional[Path]:
@@ -458,22 +577,13 @@ def resolve_qt_prefix(cli_value: Optional[str], generator: Optional[str] = None)
     Resolve the Qt prefix directory, honoring CLI, env, or auto-detection.
     Returns None if nothing is found so CMake can still try system Qt installs.
     """
-    candidates: Iterable[Optional[str]] = (
-        cli_value,
-        os.environ.get("QT_PREFIX_PATH"),
-    )
-
-    cmake_prefixes = os.environ.get("CMAKE_PREFIX_PATH")
-    if cmake_prefixes:
-        first_prefix = cmake_prefixes.split(os.pathsep)[0]
-        candidates = (*candidates, first_prefix)
-
-    for value in candidates:
+    for value in _qt_prefix_candidates(cli_value):
         if not value:
             continue
-        path = Path(value).expanduser()
-        if path.exists():
-            return path
+        # Plain string stat; only the winning candidate becomes a Path.
+        expanded = os.path.expanduser(str(value))
+        if os.path.exists(expanded):
+            return Path(expanded)
 
     preferred_flavor = detect_compiler_flavor(generator)
     return autodetect_qt_prefix(preferred_flavor)
@@ -489,6 +599,13 @@ def qt_library_dirs(prefix: Path) -> list[Path]:
     return dirs
 
 
+PDCURSES_LIBRARY_SUFFIXES = frozenset({".lib", ".a", ".so", ".dylib", ".dll"})
+# Build-tree dirs that never hold the linked library (per-target object dirs,
+# fetched dependencies); dot-dirs are skipped as well. QML_EXCLUDE_DIRS does not
+# apply here: it names source-tree dirs such as build/ and third_party/.
+PDCURSES_SEARCH_SKIP_DIRS = frozenset(BUILD_SEARCH_SKIP_DIRS)
+
+
 def find_pdcurses_paths(build_dir: Path) -> list[Path]:
     """List PDCursesMod locations: vendored source plus any built library dirs."""
     paths: list[Path] = []
@@ -497,12 +614,22 @@ def find_pdcurses_paths(build_dir: Path) -> list[Path]:
         paths.append(vendored)
 
     if build_dir.exists():
-        for ext in ("*.lib", "*.a", "*.so", "*.dylib", "*.dll"):
-            for file in build_dir.rglob(ext):
-                if "pdcurses" in file.name.lower():
-                    parent = file.parent.resolve()
-                    if parent not in paths:
-                        paths.append(parent)
+        seen: set[Path] = set(paths)
+        for dirpath, dirnames, filenames in os.walk(build_dir):
+            dirnames[:] = [
+                d for d in dirnames if d not in PDCURSES_SEARCH_SKIP_DIRS and not d.startswith(".")
+            ]
+            for filename in filenames:
+                lowered = filename.lower()
+                if "pdcurses" not in lowered:
+                    continue
+                if os.path.splitext(lowered)[1] not in PDCURSES_LIBRARY_SUFFIXES:
+                    continue
+                parent = Path(dirpath).resolve()
+                if parent not in seen:
+                    seen.add(parent)
+                    paths.append(parent)
+                break
     return paths
 
 
@@ -516,24 +643,50 @@ def detect_local_qt_version(qt_prefix_value: Optional[str]) -> tuple[Optional[st
     return version, prefix
 
 
+_PDCURSES_VERSION_CACHE: Optional[tuple[tuple, Optional[str]]] = None
+
+
 def detect_local_pdcurses_version() -> Optional[str]:
     """Read the PDCursesMod version macros from the vendored header."""
+    global _PDCURSES_VERSION_CACHE
     header = ROOT / "third_party" / "PDCursesMod" / "curses.h"
-    if not header.exists():
+    try:
+        stat = header.stat()
+    except OSError:
         return None
+    key = (str(header), stat.st_mtime_ns, stat.st_size)
+    if _PDCURSES_VERSION_CACHE is not None and _PDCURSES_VERSION_CACHE[0] == key:
+        return _PDCURSES_VERSION_CACHE[1]
+
+    version = _read_pdcurses_version(header)
+    _PDCURSES_VERSION_CACHE = (key, version)
+    return version
+
 
-    text = header.read_text(encoding="utf-8", errors="ignore")
+PDCURSES_HEADER_PREFIX_BYTES = 8192
+_PDC_VER_RE = re.compile(r"PDC_VER_(MAJOR|MINOR|CHANGE)\s+(\d+)")
 
-    def _macro_value(name: str) -> Optional[str]:
-        match = re.search(rf"{name}\s+(\d+)", text)
-        return match.group(1) if match else None
 
-    major = _macro_value("PDC_VER_MAJOR")
-    minor = _macro_value("PDC_VER_MINOR")
-    patch = _macro_value("PDC_VER_CHANGE")
-    if not all((major, minor, patch)):
+def _pdcurses_version_from_text(text: str) -> Optional[str]:
+    parts: dict[str, str] = {}
+    for match in _PDC_VER_RE.finditer(text):
+        parts.setdefault(match.group(1), match.group(2))
+        if len(parts) == 3:
+            return f"{parts['MAJOR']}.{parts['MINOR']}.{parts['CHANGE']}"
+    return None
+
+
+def _read_pdcurses_version(header: Path) -> Optional[str]:
+    """Parse the version macros, which sit near the top of curses.h."""
+    with header.open("rb") as f:
+        prefix = f.read(PDCURSES_HEADER_PREFIX_BYTES)
+        version = _pdcurses_version_from_text(prefix.decode("utf-8", errors="ignore"))
+        if version:
+            return version
+        rest = f.read()
+    if not rest:
         return None
-    return f"{major}.{minor}.{patch}"
+    return _pdcurses_version_from_text((prefix + rest).decode("utf-8", errors="ignore"))
 
 
 def detect_generator(cli_value: Optional[str]) -> Optional[str]:
@@ -547,49 +700,175 @@ def detect_generator(cli_value: Optional[str]) -> Optional[str]:
     """
     if cli_value:
         return cli_value
-    if os.environ.get("CMAKE_GENERATOR"):
-        return os.environ["CMAKE_GENERATOR"]
-    if sys.platform.startswith("win"):
+    return _detect_default_generator(os.environ.get("CMAKE_GENERATOR"), sys.platform)
+
+
+@functools.lru_cache(maxsize=8)
+def _detect_default_generator(env_generator: Optional[str], platform: str) -> Optional[str]:
+    if env_generator:
+        return env_generator
+    if platform.startswith("win"):
         vs_generator = _detect_visual_studio_generator()
         if vs_generator:
             return vs_generator
-    if shutil.which("ninja"):
+    if _which("ninja"):
         return "Ninja"
     return None
 
 
+# Checked in priority order when no distro marker file settles it.
+_PACKAGE_MANAGER_EXECUTABLES = {"apt-get": "apt", "dnf": "dnf", "yum": "dnf"}
+
+
+def _scan_path_for(tools: frozenset[str]) -> dict[str, str]:
+    """
+    Map each of tools found on PATH to its first executable location, listing
+    every PATH directory once instead of one full PATH walk per tool (POSIX
+    names only; Windows PATHEXT lookups stay with shutil.which).
+    """
+    found: dict[str, str] = {}
+    for directory in os.environ.get("PATH", "").split(os.pathsep):
+        if not directory:
+            continue
+        try:
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    if (
+                        entry.name in tools
+                        and entry.name not in found
+                        and entry.is_file()
+                        and os.access(entry.path, os.X_OK)
+                    ):
+                        found[entry.name] = entry.path
+        except OSError:
+            continue
+        if len(found) == len(tools):
+            break
+    return found
+
+
+@functools.lru_cache(maxsize=1)
 def detect_package_manager() -> Optional[str]:
     if sys.platform.startswith("win"):
         return "choco"
     if sys.platform == "darwin":
         return "brew"
-    if shutil.which("apt-get"):
-        return "apt"
-    if shutil.which("dnf"):
-        return "dnf"
-    if shutil.which("yum"):
-        return "dnf"
+    if sys.platform.startswith("linux"):
+        # A distro marker file is one stat; each which() below scans all of PATH.
+        if os.path.exists("/etc/debian_version"):
+            return "apt"
+        if os.path.exists("/etc/redhat-release") or os.path.exists("/etc/fedora-release"):
+            return "dnf"
+    found = _scan_path_for(frozenset(_PACKAGE_MANAGER_EXECUTABLES))
+    for executable, manager in _PACKAGE_MANAGER_EXECUTABLES.items():
+        if executable in found:
+            return manager
     return None
 
 
+_INSTALL_COMMANDS = {
+    "apt": "sudo apt-get install {}",
+    "dnf": "sudo dnf install {}",
+    "brew": "brew install {}",
+    "choco": "choco install {} -y",
+}
+
+
+@functools.lru_cache(maxsize=None)
 def package_install_hint(tool: str) -> str:
     mgr = detect_package_manager()
     pkg_map = PACKAGE_NAMES.get(tool, {})
-    if mgr and mgr in pkg_map:
-        pkg = pkg_map[mgr]
-        if mgr == "apt":
-            return f"sudo apt-get install {pkg}"
-        if mgr == "dnf":
-            return f"sudo dnf install {pkg}"
-        if mgr == "brew":
-            return f"brew install {pkg}"
-        if mgr == "choco":
-            return f"choco install {pkg} -y"
-    if tool in pkg_map:
-        return f"Install via your package manager ({' / '.join(pkg_map.keys())})"
+    if mgr in _INSTALL_COMMANDS and mgr in pkg_map:
+        return _INSTALL_COMMANDS[mgr].format(pkg_map[mgr])
+    if pkg_map:
+        return f"Install via your package manager ({' / '.join(pkg_map)})"
     return "Install via your package manager"
 
 
+def _detection_key(kind: str, *parts: Optional[str]) -> str:
+    return "|".join([kind, sys.platform, *(part or "" for part in parts)])
+
+
+def _compiler_stamp_paths() -> list[str]:
+    """
+    Executables a detect_compiler result hinges on: the $CXX/$CC compiler
+    when set, otherwise every candidate on PATH (plus the vswhere-located
+    Visual Studio install on Windows).
+    """
+    for env_var in ("CXX", "CC"):
+        compiler = os.environ.get(env_var)
+        if compiler:
+            return [_which(compiler) or str(Path(compiler))]
+
+    if sys.platform.startswith("win"):
+        paths = [path for path in (_which("cl"), _which("g++")) if path]
+        vs_path = _vswhere_path()
+        if vs_path:
+            paths.append(str(vs_path))
+        return paths
+    return [path for path in (_which(name) for name in ("c++", "g++", "clang++")) if path]
+
+
+def _cached_detect_compiler(
+    generator: Optional[str],
+) -> tuple[Optional[str], Optional[str], list[Path]]:
+    """
+    detect_compiler, persisted across runs. Keyed on the environment that
+    drives the lookup; invalidated when the compiler executable or a reported
+    library dir changes.
+    """
+    key = _detection_key(
+        "compiler",
+        generator,
+        os.environ.get("CXX"),
+        os.environ.get("CC"),
+        os.environ.get("PATH"),
+    )
+    hit = _detection_cache_get(key)
+    if isinstance(hit, list) and len(hit) == 3:
+        desc, hint, libs = hit
+        return desc, hint, [Path(p) for p in libs]
+
+    desc, hint, libs = detect_compiler(generator)
+    if desc:
+        lib_strings = [str(p) for p in libs]
+        _detection_cache_put(key, [desc, hint, lib_strings], _compiler_stamp_paths() + lib_strings)
+    return desc, hint, libs
+
+
+def _cached_resolve_qt_prefix(cli_value: Optional[str], generator: Optional[str]) -> Optional[Path]:
+    """
+    resolve_qt_prefix, persisted across runs. The compiler flavor steers which
+    kit gets picked, so $CXX/$CC are part of the key. Invalidated when the
+    prefix, third_party/qt6 or any of its <version> dirs (where new kits get
+    unpacked) changes.
+    """
+    key = _detection_key(
+        "qt_prefix",
+        generator,
+        cli_value,
+        os.environ.get("QT_PREFIX_PATH"),
+        os.environ.get("CMAKE_PREFIX_PATH"),
+        os.environ.get("CXX"),
+        os.environ.get("CC"),
+    )
+    hit = _detection_cache_get(key)
+    if isinstance(hit, str):
+        return Path(hit)
+
+    resolved = resolve_qt_prefix(cli_value, generator)
+    if resolved:
+        qt_root = ROOT / "third_party" / "qt6"
+        stamp_paths = [str(resolved), str(qt_root)]
+        try:
+            with os.scandir(qt_root) as entries:
+                stamp_paths.extend(sorted(entry.path for entry in entries if entry.is_dir()))
+        except OSError:
+            pass
+        _detection_cache_put(key, str(resolved), stamp_paths)
+    return resolved
+
+
 def verify_environment(
     qt_prefix: Optional[Path], generator: Optional[str], build_dir: Path
 ) -> bool:
@@ -600,7 +879,7 @@ def verify_environment(
     print("\nEnvironment verification:")
     ok = True
 
-    cmake_path = shutil.which("cmake")
+    cmake_path = _which("cmake")
     if cmake_path:
         print(f" - cmake: found at {cmake_path}")
     else:
@@ -619,7 +898,7 @@ def verify_environment(
             f"e.g. \"{ninja_hint}\" or set CMAKE_GENERATOR/--generator."
         )
 
-    compiler_desc, compiler_hint, compiler_libs = detect_compiler(detected_gen)
+    compiler_desc, compiler_hint, compiler_libs = _cached_detect_compiler(detected_gen)
     if compiler_desc:
         print(f" - compiler: {compiler_desc}")
         if compiler_hint:
@@ -631,7 +910,7 @@ def verify_environment(
         hint = compiler_hint or compiler_install_hint()
         print(f" - compiler: MISSING. {hint}")
 
-    resolved_qt = resolve_qt_prefix(str(qt_prefix) if qt_prefix else None, detected_gen)
+    resolved_qt = _cached_resolve_qt_prefix(str(qt_prefix) if qt_prefix else None, detected_gen)
     compiler_flavor = detect_compiler_flavor(detected_gen)
     if resolved_qt:
         print(f" - Qt prefix: {resolved_qt}")
@@ -667,16 +946,25 @@ def verify_environment(
     return ok
 
 
-def check_library_updates(qt_prefix_value: Optional[str]) -> bool:
+def check_library_updates(qt_prefix_value: Optional[str], *, refresh: bool = False) -> bool:
     """
     Check vendored/installed library versions against upstream releases.
+    Upstream lookups are cached on disk for six hours unless refresh is set.
     Returns True when all look queryable (even if updates are available).
     """
     print("\nChecking library updates (Qt 6, PDCursesMod):")
     ok = True
 
-    local_qt_version, qt_prefix = detect_local_qt_version(qt_prefix_value)
-    latest_qt_version, qt_source, qt_error = fetch_latest_qt_version()
+    from concurrent.futures import ThreadPoolExecutor
+
+    # The two upstream lookups are independent; overlap their round-trips.
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        qt_future = executor.submit(fetch_latest_qt_version, refresh=refresh)
+        pdc_future = executor.submit(fetch_latest_pdcurses_version, refresh=refresh)
+        local_qt_version, qt_prefix = detect_local_qt_version(qt_prefix_value)
+        latest_qt_version, qt_source, qt_error = qt_future.result()
+        latest_pdc_version, pdc_source, pdc_error = pdc_future.result()
+
     if qt_prefix:
         version_label = local_qt_version or "unknown version"
         print(f" - Qt local: {version_label} at {qt_prefix}")
@@ -701,7 +989,6 @@ def check_library_updates(qt_prefix_value: Optional[str]) -> bool:
         print(f" - Qt latest: unavailable ({qt_error or 'unknown error'})")
 
     local_pdc_version = detect_local_pdcurses_version()
-    latest_pdc_version, pdc_source, pdc_error = fetch_latest_pdcurses_version()
     if local_pdc_version:
         print(f" - PDCursesMod local: {local_pdc_version} (third_party/PDCursesMod)")
     else:
@@ -1,12 +1,54 @@
+from __future__ import annotations
+
+import functools
 import json
 import os
 import re
-import subprocess
 import sys
-import urllib.error
-import urllib.request
+import threading
 from pathlib import Path
-from typing import Iterable, Optional, Sequence, Tuple
+from typing import TYPE_CHECKING, Iterable, Optional, Sequence, Tuple
+
+from .config import disk_ttl_cache, json_loads
+from .constants import NET_CACHE_TTL_SECONDS
+
+# http.client (with ssl/email) and subprocess are imported where they are used
+# so --help and settings edits don't pay for them.
+if TYPE_CHECKING:
+    import http.client
+
+_VERSION_TRIPLE_RE = re.compile(r"(\d+)\.(\d+)\.(\d+)")
+_VERSION_NUMS_RE = re.compile(r"\d+")
+_LISTING_HREF_RE = re.compile(rb'href="((?:\d+\.)+\d+)/"')
+
+
+@functools.lru_cache(maxsize=64)
+def _which(name: str) -> Optional[str]:
+    """Memoized ``shutil.which``; cleared by ``qt.clear_toolchain_caches``."""
+    import shutil
+
+    return shutil.which(name)
+
+
+def _first_existing(candidates: Iterable[Path]) -> Optional[Path]:
+    """
+    Return the first candidate that exists, reading each parent directory once
+    with os.scandir instead of issuing one stat per candidate.
+    """
+    listings: dict[Path, frozenset[str]] = {}
+    for candidate in candidates:
+        parent = candidate.parent
+        names = listings.get(parent)
+        if names is None:
+            try:
+                with os.scandir(parent) as entries:
+                    names = frozenset(os.path.normcase(entry.name) for entry in entries)
+            except OSError:
+                names = frozenset()
+            listings[parent] = names
+        if os.path.normcase(candidate.name) in names:
+            return candidate
+    return None
 
 
 def run_command(cmd: Sequence[str], *, cwd: Optional[Path] = None) -> None:
@@ -15,13 +57,29 @@ def run_command(cmd: Sequence[str], *, cwd: Optional[Path] = None) -> None:
     if cwd:
         display = f"(cd {cwd}) {display}"
     print(f"\n>>> {display}")
+    import subprocess
+
     subprocess.run(cmd, check=True, cwd=cwd)
 
 
+def capture_output(cmd: Sequence[str], **kwargs) -> str | bytes:
+    """
+    ``subprocess.check_output`` for non-interactive tool probes (ninja target
+    lists, vswhere, compiler search dirs). stdin is closed so a probe can never
+    block on or inspect the terminal; run_command keeps stdin inherited because
+    it also launches the user's (possibly interactive) programs.
+    """
+    import subprocess
+
+    return subprocess.check_output(cmd, stdin=subprocess.DEVNULL, **kwargs)
+
+
 def parse_version_from_path(path: Path) -> Tuple[int, ...]:
     """Extract a version tuple like (6, 10, 1) from a path component."""
     for part in reversed(path.parts):
-        match = re.search(r"(\d+)\.(\d+)\.(\d+)", part)
+        if "." not in part:
+            continue
+        match = _VERSION_TRIPLE_RE.search(part)
         if match:
             return tuple(int(x) for x in match.groups())
     return tuple()
@@ -29,7 +87,7 @@ def parse_version_from_path(path: Path) -> Tuple[int, ...]:
 
 def parse_version_string(value: str) -> tuple[int, ...]:
     """Extract numeric components from a version-like string."""
-    parts = [int(x) for x in re.findall(r"\d+", value)]
+    parts = [int(x) for x in _VERSION_NUMS_RE.findall(value)]
     return tuple(parts)
 
 
@@ -57,32 +115,136 @@ def _latest_version_string(versions: Iterable[str]) -> Optional[str]:
     return max(cleaned, key=lambda v: parse_version_string(v))
 
 
-def _fetch_url(url: str, *, timeout: float = 10.0) -> tuple[Optional[str], Optional[str]]:
-    """Fetch text content from a URL, returning (body, error)."""
+_HTTP_USER_AGENT = "CPlusPlusQT6Skel-dev-tool"
+_HTTP_MAX_REDIRECTS = 5
+_HTTP_POOL: dict[tuple[str, str], list[http.client.HTTPConnection]] = {}
+_HTTP_POOL_LOCK = threading.Lock()
+
+
+def _checkout_connection(
+    scheme: str, netloc: str, timeout: float
+) -> tuple[http.client.HTTPConnection, bool]:
+    """Return (connection, reused) for a host, preferring an idle keep-alive one."""
+    with _HTTP_POOL_LOCK:
+        idle = _HTTP_POOL.get((scheme, netloc))
+        if idle:
+            conn = idle.pop()
+            conn.timeout = timeout
+            return conn, True
+    import http.client
+
+    if scheme == "https":
+        return http.client.HTTPSConnection(netloc, timeout=timeout), False
+    return http.client.HTTPConnection(netloc, timeout=timeout), False
+
+
+def _checkin_connection(scheme: str, netloc: str, conn: http.client.HTTPConnection) -> None:
+    with _HTTP_POOL_LOCK:
+        _HTTP_POOL.setdefault((scheme, netloc), []).append(conn)
+
+
+def _http_get(url: str, *, timeout: float) -> tuple[http.client.HTTPResponse, bytes]:
+    """GET a single URL over a pooled connection, retrying once on a stale socket."""
+    import http.client
+    import urllib.parse
+
+    parts = urllib.parse.urlsplit(url)
+    if parts.scheme not in {"http", "https"}:
+        raise OSError(f"Unsupported URL scheme: {url}")
+    target = parts.path or "/"
+    if parts.query:
+        target = f"{target}?{parts.query}"
+    headers = {"User-Agent": _HTTP_USER_AGENT, "Accept-Encoding": "identity"}
+    while True:
+        conn, reused = _checkout_connection(parts.scheme, parts.netloc, timeout)
+        try:
+            conn.request("GET", target, headers=headers)
+            resp = conn.getresponse()
+            body = resp.read()
+        except (http.client.HTTPException, OSError):
+            conn.close()
+            if reused:
+                continue
+            raise
+        if resp.will_close:
+            conn.close()
+        else:
+            _checkin_connection(parts.scheme, parts.netloc, conn)
+        return resp, body
+
+
+def _uses_proxy(url: str) -> bool:
+    """True when urllib's proxy settings (env/registry) would route url via a proxy."""
+    import urllib.parse
+    import urllib.request
+
+    parts = urllib.parse.urlsplit(url)
+    if parts.scheme not in urllib.request.getproxies():
+        return False
+    return not urllib.request.proxy_bypass(parts.hostname or "")
+
+
+def _urlopen(url: str, *, timeout: float) -> tuple[http.client.HTTPResponse, bytes]:
+    """GET through urllib, which handles proxies, CONNECT tunnels and redirects itself."""
+    import urllib.request
+
+    request = urllib.request.Request(url, headers={"User-Agent": _HTTP_USER_AGENT})
+    with urllib.request.urlopen(request, timeout=timeout) as resp:
+        return resp, resp.read()
+
+
+def _open_url(url: str, *, timeout: float) -> tuple[http.client.HTTPResponse, bytes]:
+    """
+    GET a URL following redirects; raises OSError on HTTP errors. Direct
+    requests reuse pooled connections; proxied ones go through urllib.
+    """
+    import urllib.parse
+
+    for _ in range(_HTTP_MAX_REDIRECTS + 1):
+        if _uses_proxy(url):
+            return _urlopen(url, timeout=timeout)
+        resp, body = _http_get(url, timeout=timeout)
+        location = resp.getheader("Location")
+        if resp.status in {301, 302, 303, 307, 308} and location:
+            url = urllib.parse.urljoin(url, location)
+            continue
+        if resp.status >= 400:
+            raise OSError(f"HTTP Error {resp.status}: {resp.reason}")
+        return resp, body
+    raise OSError(f"Too many redirects fetching {url}")
+
+
+def _fetch_url_bytes(url: str, *, timeout: float = 10.0) -> tuple[Optional[bytes], Optional[str]]:
+    """Fetch raw bytes from a URL, returning (body, error)."""
+    import http.client
+
     try:
-        with urllib.request.urlopen(url, timeout=timeout) as resp:
-            charset = resp.headers.get_content_charset() or "utf-8"
-            return resp.read().decode(charset, errors="ignore"), None
-    except (urllib.error.URLError, urllib.error.HTTPError, TimeoutError, OSError) as exc:
+        _, body = _open_url(url, timeout=timeout)
+    except (http.client.HTTPException, TimeoutError, OSError) as exc:
         return None, str(exc)
+    return body, None
 
 
-def _extract_versions_from_listing(html: str, *, segments: Optional[int] = None) -> list[str]:
-    """Collect version strings like 6.7.2 from a simple directory listing."""
-    matches = re.findall(r'href="((?:\d+\.)+\d+)/"', html)
+def _extract_versions_from_listing(listing: bytes, *, segments: Optional[int] = None) -> list[str]:
+    """
+    Collect version strings like 6.7.2 from a simple directory listing.
+    Scans the raw bytes and decodes only the matched hrefs.
+    """
     versions: list[str] = []
-    for match in matches:
+    for raw in _LISTING_HREF_RE.findall(listing):
+        match = raw.decode("ascii")
         tupled = parse_version_string(match)
         if segments and len(tupled) != segments:
             continue
-        versions.append(match.rstrip("/"))
+        versions.append(match)
     return versions
 
 
+@disk_ttl_cache("qt_latest", ttl=NET_CACHE_TTL_SECONDS)
 def fetch_latest_qt_version() -> tuple[Optional[str], str, Optional[str]]:
     """Return (version, source_url, error) for the newest Qt 6 release."""
     base_url = "https://download.qt.io/official_releases/qt/"
-    listing, error = _fetch_url(base_url)
+    listing, error = _fetch_url_bytes(base_url)
     if not listing:
         return None, base_url, error
 
@@ -95,7 +257,7 @@ def fetch_latest_qt_version() -> tuple[Optional[str], str, Optional[str]]:
     if not newest_major_minor:
         return None, base_url, "No Qt 6 versions found in the release index."
 
-    patch_listing, patch_error = _fetch_url(f"{base_url}{newest_major_minor}/")
+    patch_listing, patch_error = _fetch_url_bytes(f"{base_url}{newest_major_minor}/")
     if patch_listing:
         patch_versions = [
             version
@@ -109,14 +271,15 @@ def fetch_latest_qt_version() -> tuple[Optional[str], str, Optional[str]]:
     return newest_major_minor, base_url, patch_error
 
 
+@disk_ttl_cache("pdcurses_latest", ttl=NET_CACHE_TTL_SECONDS)
 def fetch_latest_pdcurses_version() -> tuple[Optional[str], str, Optional[str]]:
     """Return (version, source_url, error) for the latest PDCursesMod release."""
     api_url = "https://api.github.com/repos/Bill-Gray/PDCursesMod/releases/latest"
-    payload, error = _fetch_url(api_url)
+    payload, error = _fetch_url_bytes(api_url)
     if not payload:
         return None, api_url, error
     try:
-        data = json.loads(payload)
+        data = json_loads(payload)
     except json.JSONDecodeError as exc:
         return None, api_url, f"Failed to parse GitHub response: {exc}"
 
@@ -134,19 +297,23 @@ def prompt_for_choice(options: Sequence[str], *, prompt: str) -> str:
     """Simple interactive selector for small option lists."""
     if not sys.stdin.isatty():
         raise ValueError("No target provided and input is not interactive.")
-    for idx, opt in enumerate(options, start=1):
-        print(f"[{idx}] {opt}")
+    valid = {str(idx): opt for idx, opt in enumerate(options, start=1)}
+    # One write for the whole menu instead of a print() per option.
+    print("\n".join(f"[{key}] {opt}" for key, opt in valid.items()))
     while True:
         choice = input(f"{prompt} [1-{len(options)}]: ").strip()
         if not choice:
             return options[0]
-        if choice.isdigit():
-            idx = int(choice)
-            if 1 <= idx <= len(options):
-                return options[idx - 1]
+        # Exact lookup also rejects "0", "01" and non-ASCII digits like "²".
+        selected = valid.get(choice)
+        if selected is not None:
+            return selected
         print("Invalid selection, try again.")
 
 
+_YES_NO_ANSWERS = {"y": True, "yes": True, "n": False, "no": False}
+
+
 def prompt_yes_no(question: str, *, default: bool = True) -> bool:
     """TTY-only yes/no prompt with default."""
     if not sys.stdin.isatty():
@@ -156,8 +323,7 @@ def prompt_yes_no(question: str, *, default: bool = True) -> bool:
         choice = input(f"{question} ({suffix}): ").strip().lower()
         if not choice:
             return default
-        if choice in ("y", "yes"):
-            return True
-        if choice in ("n", "no"):
-            return False
+        answer = _YES_NO_ANSWERS.get(choice)
+        if answer is not None:
+            return answer
         print("Please enter y or n.")
@@ -4,6 +4,7 @@ import subprocess
 from typing import Optional, Sequence
 
 from .downloader import (
+    DEFAULT_JOBS,
     DEFAULT_MODULES,
     DEFAULT_QT_VERSION,
     build_install_qt_cmd,
@@ -13,8 +14,11 @@ from .downloader import (
     detect_host,
     detect_latest_qt_version,
     ensure_aqtinstall,
+    qt_install_is_recorded,
+    record_qt_install,
     resolve_compiler,
     run,
+    run_in_background,
 )
 
 
@@ -63,11 +67,28 @@ def parse_args(argv: Optional[Sequence[str]] = None) -> argparse.Namespace:
         type=int,
         help="Download timeout (seconds) forwarded to aqtinstall.",
     )
+    parser.add_argument(
+        "--refresh-version-cache",
+        action="store_true",
+        help="Ignore cached `aqt list-qt` results (kept for a day) when detecting the latest Qt.",
+    )
     parser.add_argument(
         "--with-tools",
         action="store_true",
         help="Also download ninja and CMake from Qt's tool repos.",
     )
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        default=DEFAULT_JOBS,
+        help="Maximum aqt installs to run at once; tool downloads overlap the Qt install "
+        f"(default: {DEFAULT_JOBS}, 1 = strictly one after another).",
+    )
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        help="Run aqt install-qt even if this version/compiler/module set was already installed here.",
+    )
     parser.add_argument(
         "--dry-run",
         action="store_true",
@@ -96,6 +117,40 @@ def parse_args(argv: Optional[Sequence[str]] = None) -> argparse.Namespace:
     return parser.parse_args(argv)
 
 
+def _install_qt(
+    args: argparse.Namespace,
+    user_supplied_qt_version: bool,
+    auto_detected_qt_version: Optional[str],
+) -> None:
+    if not args.force and qt_install_is_recorded(args):
+        print(
+            f"Qt {args.qt_version} ({args.compiler}) already installed in "
+            f"{os.path.abspath(args.output_dir)}; use --force to reinstall."
+        )
+        return
+
+    install_qt_cmd = build_install_qt_cmd(args)
+    try:
+        run(install_qt_cmd, dry_run=args.dry_run)
+    except subprocess.CalledProcessError:
+        if (
+            not user_supplied_qt_version
+            and auto_detected_qt_version
+            and auto_detected_qt_version != DEFAULT_QT_VERSION
+        ):
+            print(
+                f"Failed to install detected Qt version {auto_detected_qt_version}; "
+                f"falling back to {DEFAULT_QT_VERSION}."
+            )
+            args.qt_version = DEFAULT_QT_VERSION
+            install_qt_cmd = build_install_qt_cmd(args)
+            run(install_qt_cmd, dry_run=args.dry_run)
+        else:
+            raise
+    if not args.dry_run:
+        record_qt_install(args)
+
+
 def main(argv: Optional[Sequence[str]] = None) -> None:
     args = parse_args(argv)
     user_supplied_qt_version = args.qt_version is not None
@@ -124,6 +179,7 @@ def main(argv: Optional[Sequence[str]] = None) -> None:
             base_url=args.base_url,
             timeout=args.timeout,
             compiler=args.compiler,
+            refresh=args.refresh_version_cache,
         )
         if detected_qt:
             print(f"Detected latest Qt version: {detected_qt}")
@@ -133,31 +189,20 @@ def main(argv: Optional[Sequence[str]] = None) -> None:
             print(f"Could not detect latest Qt version; defaulting to {DEFAULT_QT_VERSION}")
             args.qt_version = DEFAULT_QT_VERSION
 
-    install_qt_cmd = build_install_qt_cmd(args)
-    try:
-        run(install_qt_cmd, dry_run=args.dry_run)
-    except subprocess.CalledProcessError:
-        if (
-            not user_supplied_qt_version
-            and auto_detected_qt_version
-            and auto_detected_qt_version != DEFAULT_QT_VERSION
-        ):
-            print(
-                f"Failed to install detected Qt version {auto_detected_qt_version}; "
-                f"falling back to {DEFAULT_QT_VERSION}."
-            )
-            args.qt_version = DEFAULT_QT_VERSION
-            install_qt_cmd = build_install_qt_cmd(args)
-            run(install_qt_cmd, dry_run=args.dry_run)
-        else:
-            raise
+    tool_cmds = list(build_install_tools_cmds(args)) if args.with_tools else []
+    # Tools land in their own Tools/ subtree and do not depend on the Qt version,
+    # so they can download while Qt installs. A dry run stays sequential so the
+    # printed commands keep their order.
+    workers = 0 if args.dry_run else min(len(tool_cmds), max(args.jobs, 1) - 1)
+    with run_in_background(tool_cmds, dry_run=args.dry_run, workers=workers) as pending_tools:
+        _install_qt(args, user_supplied_qt_version, auto_detected_qt_version)
 
-    if args.with_tools:
-        for cmd in build_install_tools_cmds(args):
+        for cmd in pending_tools:
             run(cmd, dry_run=args.dry_run)
 
-    if args.with_src:
-        install_src_cmd = build_install_src_cmd(args)
-        run(install_src_cmd, dry_run=args.dry_run)
+        if args.with_src:
+            # Runs after the Qt install so it follows a fallback to DEFAULT_QT_VERSION.
+            install_src_cmd = build_install_src_cmd(args)
+            run(install_src_cmd, dry_run=args.dry_run)
 
     print("Done. Qt is in:", os.path.abspath(args.output_dir))
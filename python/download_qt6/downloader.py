@@ -15,13 +15,19 @@ More docs: https://aqtinstall.readthedocs.io/
 from __future__ import annotations
 
 import argparse
+import contextlib
+import functools
 import importlib.util
+import json
 import os
 import re
+import shlex
 import shutil
 import subprocess
 import sys
-from typing import Iterable, List, Optional, Tuple
+import threading
+import time
+from typing import Iterable, Iterator, List, Optional, Tuple
 
 
 DEFAULT_MODULES = [
@@ -39,6 +45,19 @@ DEFAULT_MODULES = [
 ]
 
 DEFAULT_QT_VERSION = "6.7.2"
+# aqt processes allowed at once: the Qt install plus the two tool downloads.
+DEFAULT_JOBS = 3
+# Records finished `aqt install-qt` runs inside the output dir (see qt_install_is_recorded).
+INSTALL_MANIFEST_NAME = ".qt_install_manifest.json"
+# How long `aqt list-qt` answers are reused before asking the Qt CDN again.
+LIST_CACHE_TTL_SECONDS = 24 * 60 * 60
+# Wall-clock limit for one `aqt list-qt` subprocess when --timeout is not given.
+DEFAULT_PROBE_TIMEOUT = 30
+# Versions whose `aqt list-qt --arch` probes run at once, newest first.
+VERSION_PROBE_WINDOW = 4
+
+_LIST_CACHE_LOCK = threading.Lock()
+_VERSION_NUMS_RE = re.compile(r"\d+")
 DEFAULT_WINDOWS_COMPILER = "win64_msvc2019_64"
 DEFAULT_COMPILERS = {
     "windows": DEFAULT_WINDOWS_COMPILER,
@@ -47,14 +66,44 @@ DEFAULT_COMPILERS = {
 }
 
 
+def format_cmd(cmd: List[str]) -> str:
+    """Render cmd so it can be pasted back into the platform's shell."""
+    if os.name == "nt":
+        return subprocess.list2cmdline(cmd)
+    return shlex.join(cmd)
+
+
 def run(cmd: List[str], *, dry_run: bool) -> None:
     """Print and execute a command."""
-    print(" ".join(cmd))
+    # One write per line so commands echoed from concurrent installs don't interleave.
+    sys.stdout.write(format_cmd(cmd) + "\n")
     if dry_run:
         return
     subprocess.check_call(cmd)
 
 
+@contextlib.contextmanager
+def run_in_background(
+    cmds: List[List[str]], *, dry_run: bool, workers: int
+) -> Iterator[List[List[str]]]:
+    """
+    Start up to ``workers`` of cmds on background threads and yield the rest for
+    the caller to run itself. On exit, wait for the background commands and
+    re-raise the first failure.
+    """
+    if workers <= 0:
+        yield list(cmds)
+        return
+
+    from concurrent.futures import ThreadPoolExecutor
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(run, cmd, dry_run=dry_run) for cmd in cmds[:workers]]
+        yield cmds[workers:]
+        for future in futures:
+            future.result()
+
+
 def ensure_aqtinstall(*, dry_run: bool) -> None:
     """Install aqtinstall if missing so we can fetch Qt archives."""
     if shutil.which("aqt"):
@@ -90,6 +139,79 @@ def build_install_qt_cmd(args: argparse.Namespace) -> List[str]:
     return cmd
 
 
+def _install_manifest_path(output_dir: str) -> str:
+    return os.path.join(output_dir, INSTALL_MANIFEST_NAME)
+
+
+def _install_key(args: argparse.Namespace) -> str:
+    return " ".join((args.host, args.target, args.qt_version, args.compiler))
+
+
+def _qt_arch_dir(host: str, compiler: str, qt_version: str) -> Optional[str]:
+    """
+    Directory aqt unpacks compiler into under <output_dir>/<qt_version>, for
+    the arches whose naming is stable (MSVC, Linux gcc, macOS); None otherwise.
+    """
+    if re.fullmatch(r"win(?:32|64)_msvc\d{4}(?:_\w+)?", compiler):
+        return compiler.split("_", 1)[1]
+    if host == "linux" and compiler.startswith("linux_"):
+        return compiler[len("linux_"):]
+    if host == "mac" and compiler == "clang_64":
+        nums = tuple(int(n) for n in _VERSION_NUMS_RE.findall(qt_version))
+        return "macos" if nums >= (6, 1, 2) else compiler
+    return None
+
+
+def _qt_arch_installed(args: argparse.Namespace) -> bool:
+    """True when the arch dir for args.compiler (or, if unpredictable, any arch dir) has a bin/."""
+    version_dir = os.path.join(args.output_dir, args.qt_version)
+    arch_dir = _qt_arch_dir(args.host, args.compiler, args.qt_version)
+    if arch_dir:
+        return os.path.isdir(os.path.join(version_dir, arch_dir, "bin"))
+    try:
+        with os.scandir(version_dir) as entries:
+            return any(
+                entry.is_dir() and os.path.isdir(os.path.join(entry.path, "bin"))
+                for entry in entries
+            )
+    except OSError:
+        return False
+
+
+def qt_install_is_recorded(args: argparse.Namespace) -> bool:
+    """
+    True when a previous run installed this host/target/version/compiler into
+    args.output_dir with every requested module (an empty module list means
+    "all archives" and is only satisfied by an earlier all-archives install),
+    and that compiler's arch dir is still on disk.
+    """
+    if not _qt_arch_installed(args):
+        return False
+    entry = _load_json_dict(_install_manifest_path(args.output_dir)).get(_install_key(args))
+    if not isinstance(entry, dict) or not isinstance(entry.get("modules"), list):
+        return False
+    installed = entry["modules"]
+    if not installed:
+        return True
+    return bool(args.modules) and set(args.modules) <= set(installed)
+
+
+def record_qt_install(args: argparse.Namespace) -> None:
+    """Remember a successful install (merged with earlier ones) so the next run can skip it."""
+    path = _install_manifest_path(args.output_dir)
+    manifest = _load_json_dict(path)
+    key = _install_key(args)
+    previous = manifest.get(key)
+    modules: set[str] = set(args.modules or [])
+    if isinstance(previous, dict) and isinstance(previous.get("modules"), list):
+        # aqt adds archives to an existing tree, so earlier modules are still there.
+        modules = set() if not previous["modules"] else modules | set(previous["modules"])
+    if not args.modules:
+        modules = set()
+    manifest[key] = {"modules": sorted(modules), "stamp": time.time()}
+    _store_json(path, manifest)
+
+
 def build_install_tools_cmds(args: argparse.Namespace) -> Iterable[List[str]]:
     """Optionally pull in build helper tools (ninja + CMake) via Qt maintenance repo."""
     tools = ["tools_ninja", "tools_cmake"]
@@ -200,6 +322,141 @@ def detect_msvc_compiler() -> Tuple[Optional[str], Optional[int], Optional[str]]
     return None, major, raw_version
 
 
+def _list_cache_path() -> str:
+    """JSON file holding cached `aqt list-qt` output (XDG cache dir / %LOCALAPPDATA%)."""
+    if sys.platform.startswith("win"):
+        base = os.environ.get("LOCALAPPDATA") or os.path.expanduser("~")
+    else:
+        base = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return os.path.join(base, "CPlusPlusQT6Skel", "aqt_list_cache.json")
+
+
+def _load_json_dict(path: str) -> dict:
+    try:
+        with open(path, encoding="utf-8") as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    return data if isinstance(data, dict) else {}
+
+
+def _store_json(path: str, data: dict) -> None:
+    """Write via a temp file + os.replace so concurrent runs never see a torn file."""
+    tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    try:
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(data, f)
+        os.replace(tmp, path)
+    except OSError:
+        with contextlib.suppress(OSError):
+            os.remove(tmp)
+
+
+@functools.lru_cache(maxsize=1)
+def _aqt_metadata_api() -> Optional[tuple]:
+    """(MetadataFactory, ArchiveId) from the installed aqt, or None if it cannot be used in-process."""
+    try:
+        from aqt.helper import Settings
+        from aqt.metadata import ArchiveId, MetadataFactory
+
+        load_settings = getattr(Settings, "load_settings", None)
+        if load_settings is not None:
+            load_settings()
+    except Exception:
+        return None
+    return MetadataFactory, ArchiveId
+
+
+def _aqt_list_in_process(
+    host: str, target: str, arch_version: Optional[str], base_url: Optional[str]
+) -> Optional[str]:
+    """
+    `aqt list-qt` answered through aqt's metadata API, skipping a Python + aqt
+    start-up per query. Returns whitespace-separated tokens like the CLI output,
+    or None whenever the API is missing or behaves unexpectedly (callers then
+    fall back to the subprocess).
+    """
+    api = _aqt_metadata_api()
+    if api is None:
+        return None
+    metadata_factory, archive_id = api
+    kwargs: dict = {}
+    if arch_version:
+        kwargs["architectures_ver"] = arch_version
+    if base_url:
+        kwargs["base_url"] = base_url
+    try:
+        result = metadata_factory(archive_id("qt", host, target), **kwargs).getList()
+        tokens: List[str] = []
+        for item in result:
+            if isinstance(item, (list, tuple)):
+                tokens.extend(str(part) for part in item)
+            else:
+                tokens.append(str(item))
+    except Exception:
+        return None
+    return "\n".join(tokens)
+
+
+def _aqt_list_output(
+    host: str,
+    target: str,
+    *,
+    arch_version: Optional[str] = None,
+    base_url: Optional[str],
+    timeout: Optional[int],
+    refresh: bool,
+) -> Optional[str]:
+    """
+    Output of `aqt list-qt <host> <target> [--arch <arch_version>]`, reused from disk
+    for LIST_CACHE_TTL_SECONDS. Failures return None and are never cached;
+    refresh=True skips the cached value.
+    """
+    list_args = [host, target]
+    if arch_version:
+        list_args.extend(["--arch", arch_version])
+    if base_url:
+        list_args.extend(["--base", base_url])
+
+    key = " ".join(list_args)
+    cache = _load_json_dict(_list_cache_path())
+    entry = cache.get(key)
+    if (
+        not refresh
+        and isinstance(entry, dict)
+        and isinstance(entry.get("fetched"), (int, float))
+        and time.time() - entry["fetched"] < LIST_CACHE_TTL_SECONDS
+    ):
+        return str(entry.get("output", ""))
+
+    # The library API has no per-call timeout, so an explicit --timeout keeps the CLI.
+    output = None if timeout else _aqt_list_in_process(host, target, arch_version, base_url)
+    if output is None:
+        cmd = [sys.executable, "-m", "aqt", "list-qt", *list_args]
+        if timeout:
+            cmd.extend(["--timeout", str(timeout)])
+        try:
+            output = subprocess.run(
+                cmd,
+                stdin=subprocess.DEVNULL,
+                capture_output=True,
+                text=True,
+                encoding="utf-8",
+                timeout=timeout or DEFAULT_PROBE_TIMEOUT,
+                check=True,
+            ).stdout
+        except (subprocess.CalledProcessError, FileNotFoundError, subprocess.TimeoutExpired):
+            return None
+
+    with _LIST_CACHE_LOCK:
+        # Re-read so entries stored by concurrent probes are kept.
+        cache = _load_json_dict(_list_cache_path())
+        cache[key] = {"fetched": time.time(), "output": output}
+        _store_json(_list_cache_path(), cache)
+    return output
+
+
 def detect_latest_qt_version(
     *,
     host: str,
@@ -207,96 +464,74 @@ def detect_latest_qt_version(
     base_url: Optional[str],
     timeout: Optional[int],
     compiler: Optional[str],
+    refresh: bool = False,
 ) -> Optional[str]:
-    """Ask aqt for the newest Qt version available for the given host/target, validating availability."""
+    """
+    Ask aqt for the newest Qt version available for the given host/target, validating availability.
+    aqt answers are cached on disk for a day; refresh=True queries the CDN again.
+    """
 
     if importlib.util.find_spec("aqt") is None:
         return None
 
-    def _build_cmd(extra: Optional[str] = None) -> List[str]:
-        cmd = [sys.executable, "-m", "aqt", "list-qt", host, target]
-        if extra:
-            cmd.append(extra)
-        if base_url:
-            cmd.extend(["--base", base_url])
-        if timeout:
-            cmd.extend(["--timeout", str(timeout)])
-        return cmd
-
     def _version_key(v: str) -> Tuple[int, ...]:
         # Keep only numeric components to allow simple sorting (e.g., 6.10.1).
-        parts = re.split(r"[^\d]+", v)
-        nums = []
-        for p in parts:
-            if p == "":
-                continue
-            try:
-                nums.append(int(p))
-            except ValueError:
-                nums.append(0)
-        return tuple(nums)
+        return tuple(map(int, _VERSION_NUMS_RE.findall(v)))
 
     def _list_versions() -> List[str]:
-        try:
-            output = subprocess.check_output(
-                _build_cmd(),
-                text=True,
-                encoding="utf-8",
-                timeout=timeout if timeout else None,
-            )
-        except (subprocess.CalledProcessError, FileNotFoundError, subprocess.TimeoutExpired):
-            return []
-        versions: List[str] = []
-        for line in output.splitlines():
-            for token in line.strip().split():
-                if token:
-                    versions.append(token)
-        return versions
+        output = _aqt_list_output(
+            host, target, base_url=base_url, timeout=timeout, refresh=refresh
+        )
+        # Versions are whitespace-separated, one minor series per line.
+        return output.split() if output else []
 
     def _version_has_archives(version: str) -> bool:
         # Validate by asking aqt for available architectures for the version; if it errors, skip it.
-        cmd = [sys.executable, "-m", "aqt", "list-qt", host, target, "--arch", version]
-        if base_url:
-            cmd.extend(["--base", base_url])
-        if timeout:
-            cmd.extend(["--timeout", str(timeout)])
-        try:
-            output = subprocess.check_output(
-                cmd,
-                text=True,
-                encoding="utf-8",
-                timeout=timeout if timeout else None,
-            )
-        except (subprocess.CalledProcessError, FileNotFoundError, subprocess.TimeoutExpired):
-            return False
-        if not output.strip():
+        output = _aqt_list_output(
+            host,
+            target,
+            arch_version=version,
+            base_url=base_url,
+            timeout=timeout,
+            refresh=refresh,
+        )
+        archs = output.split() if output else []
+        if not archs:
             return False
-        if compiler:
-            archs = {token for line in output.splitlines() for token in line.strip().split() if token}
-            if compiler not in archs:
-                return False
-        return True
+        return not compiler or compiler in archs
 
-    versions = _list_versions()
-    for version in sorted(versions, key=_version_key, reverse=True):
-        if _version_has_archives(version):
-            return version
+    # aqt can only list architectures for one version per call, so probe a small
+    # window of the newest versions concurrently and keep the newest that passes.
+    candidates = sorted(_list_versions(), key=_version_key, reverse=True)
+    if not candidates:
+        return None
+
+    from concurrent.futures import ThreadPoolExecutor
+
+    with ThreadPoolExecutor(max_workers=VERSION_PROBE_WINDOW) as pool:
+        for start in range(0, len(candidates), VERSION_PROBE_WINDOW):
+            window = candidates[start : start + VERSION_PROBE_WINDOW]
+            for version, ok in zip(window, pool.map(_version_has_archives, window)):
+                if ok:
+                    return version
 
     return None
 
 
+@functools.lru_cache(maxsize=1)
 def _read_os_release() -> Tuple[Optional[str], Optional[str]]:
     """Return (id, version_id) from /etc/os-release if present."""
-    path = "/etc/os-release"
-    if not os.path.exists(path):
+    try:
+        with open("/etc/os-release", encoding="utf-8", errors="replace") as f:
+            text = f.read()
+    except OSError:
         return None, None
-    data: dict[str, str] = {}
-    with open(path, encoding="utf-8") as f:
-        for line in f:
-            if "=" not in line:
-                continue
-            key, value = line.strip().split("=", 1)
-            data[key] = value.strip('"')
+    # Shell-style assignments: shlex handles single/double quotes, escapes and comments.
+    try:
+        tokens = shlex.split(text, comments=True)
+    except ValueError:
+        return None, None
+    data = dict(token.split("=", 1) for token in tokens if "=" in token)
     return data.get("ID"), data.get("VERSION_ID")
 
 
@@ -304,6 +539,35 @@ def _command_exists(cmd: str) -> bool:
     return shutil.which(cmd) is not None
 
 
+def _missing_deb_packages(packages: List[str]) -> List[str]:
+    """Subset of packages dpkg does not report as installed (all of them if dpkg-query is unusable)."""
+    try:
+        result = subprocess.run(
+            ["dpkg-query", "-W", "-f=${Package} ${db:Status-Abbrev}\\n", *packages],
+            stdin=subprocess.DEVNULL,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            text=True,
+        )
+    except OSError:
+        return list(packages)
+    installed = set()
+    for line in result.stdout.splitlines():
+        name, _, status = line.partition(" ")
+        if status.startswith("ii"):
+            # Multi-arch packages are reported as name:arch.
+            installed.add(name.split(":", 1)[0])
+    return [pkg for pkg in packages if pkg not in installed]
+
+
+def _apt_lists_are_fresh(max_age: float = 24 * 60 * 60) -> bool:
+    """True when apt's package cache was rebuilt within max_age seconds."""
+    try:
+        return time.time() - os.stat("/var/cache/apt/pkgcache.bin").st_mtime < max_age
+    except OSError:
+        return False
+
+
 def check_build_dependencies(
     *,
     host: str,
@@ -317,7 +581,7 @@ def check_build_dependencies(
             run(cmd, dry_run=dry_run)
         else:
             print("Missing dependency; rerun with --install-build-deps to install:")
-            print(" ", " ".join(cmd))
+            print(" ", format_cmd(cmd))
 
     if host == "mac":
         print("Checking macOS build tools (Xcode Command Line Tools, Homebrew, CMake, Ninja)...")
@@ -348,16 +612,18 @@ def check_build_dependencies(
         print(f"Detected Linux distro: {distro_id or 'unknown'} {version_id or ''}".strip())
         if distro_id in {"ubuntu", "debian"}:
             required = ["build-essential", "libgl1-mesa-dev", "libxkbcommon-x11-0", "ninja-build", "cmake"]
-            for cmd in (["sudo", "apt-get", "update"], ["sudo", "apt-get", "install", "-y", *required]):
-                maybe_install(cmd)
+            missing = _missing_deb_packages(required)
+            if not missing:
+                print("All build dependencies are already installed.")
+                return
+            if not _apt_lists_are_fresh():
+                maybe_install(["sudo", "apt-get", "update"])
+            maybe_install(["sudo", "apt-get", "install", "-y", *missing])
             return
         if distro_id in {"fedora", "rhel", "centos", "rocky", "almalinux"}:
-            required = ["mesa-libGL-devel", "libxkbcommon-devel", "ninja-build", "cmake"]
-            for cmd in (
-                ["sudo", "dnf", "groupinstall", "-y", "Development Tools"],
-                ["sudo", "dnf", "install", "-y", *required],
-            ):
-                maybe_install(cmd)
+            # One transaction: a single dependency solve and metadata refresh for the group and packages.
+            required = ["@Development Tools", "mesa-libGL-devel", "libxkbcommon-devel", "ninja-build", "cmake"]
+            maybe_install(["sudo", "dnf", "install", "-y", *required])
             return
         print("Unknown Linux distro; ensure you have a C++ toolchain, CMake, Ninja, and OpenGL headers installed.")
         return
@@ -1,3 +1,4 @@
+import os
 import tempfile
 from pathlib import Path
 from unittest import TestCase, mock
@@ -6,6 +7,20 @@ import dev_tool
 
 
 class DevToolCLITests(TestCase):
+    def setUp(self) -> None:
+        # Detection helpers are memoized per process; start each test clean.
+        from python.dev_tool.qt import clear_toolchain_caches
+
+        clear_toolchain_caches()
+        # Keep persisted caches (detect_cache.json etc.) out of the real config dir.
+        config_home = tempfile.TemporaryDirectory()
+        self.addCleanup(config_home.cleanup)
+        env = mock.patch.dict(
+            os.environ, {"XDG_CONFIG_HOME": config_home.name, "APPDATA": config_home.name}
+        )
+        env.start()
+        self.addCleanup(env.stop)
+
     def test_default_no_args_uses_menu_when_tty(self) -> None:
         with tempfile.TemporaryDirectory() as tmp:
             tmp_path = Path(tmp)
@@ -56,6 +71,34 @@ class DevToolCLITests(TestCase):
         # configure + build + run
         self.assertEqual(run_cmd.call_count, 3)
 
+    def test_menu_rebuilds_context_after_settings(self) -> None:
+        from python.dev_tool import cli, config
+
+        def _change_settings(args) -> int:
+            config.set_settings({"build_type": "Release"})
+            return 0
+
+        seen_build_types = []
+        with tempfile.TemporaryDirectory() as tmp, \
+            mock.patch.object(config, "_USER_SETTINGS", None), \
+            mock.patch.object(config, "_RESOLVED_SETTINGS", None), \
+            mock.patch.object(config, "_SETTINGS_CACHE", None), \
+            mock.patch.object(cli, "detect_generator", return_value=None), \
+            mock.patch.object(cli, "ensure_qt_prefix", return_value=None), \
+            mock.patch.object(cli, "_cmd_settings", side_effect=_change_settings), \
+            mock.patch.dict(cli.COMMAND_HANDLERS, {"verify": lambda ctx: seen_build_types.append(ctx.build_type) or 0}), \
+            mock.patch.object(cli, "prompt_for_choice", side_effect=["verify", "settings", "verify", "quit"]), \
+            mock.patch("sys.stdin.isatty", return_value=True):
+            result = cli.main(["menu", "--build-dir", tmp])
+
+        self.assertEqual(result, 0)
+        self.assertEqual(seen_build_types, ["Debug", "Release"])
+
+    def test_script_forwards_user_settings(self) -> None:
+        self.assertIn("build_dir", dev_tool.USER_SETTINGS)
+        with self.assertRaises(AttributeError):
+            dev_tool.NOT_A_SETTING
+
     def test_verify_reports_missing(self) -> None:
         with mock.patch("dev_tool.shutil.which", return_value=None), \
             mock.patch("dev_tool.detect_generator", return_value=None), \
@@ -69,3 +112,222 @@ class DevToolCLITests(TestCase):
             mock.patch("dev_tool.resolve_qt_prefix", return_value=Path("/qt")):
             result = dev_tool.main(["verify"])
         self.assertEqual(result, 0)
+
+
+class ConfigureSkipTests(TestCase):
+    def _configure(self, build_dir: Path) -> mock.Mock:
+        from python.dev_tool import project
+
+        with mock.patch.object(project, "run_command") as run_cmd:
+            project.configure_project(build_dir, "Unix Makefiles", "Debug", None)
+        return run_cmd
+
+    @staticmethod
+    def _write(path: Path, text: str, mtime_offset_s: int) -> None:
+        import time
+
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(text, encoding="utf-8")
+        stamp = time.time_ns() + mtime_offset_s * 1_000_000_000
+        os.utime(path, ns=(stamp, stamp))
+
+    def _write_cache(self, build_dir: Path) -> None:
+        self._write(
+            build_dir / "CMakeCache.txt",
+            "CMAKE_GENERATOR:INTERNAL=Unix Makefiles\nCMAKE_BUILD_TYPE:STRING=Debug\n",
+            100,
+        )
+
+    def test_cache_without_build_system_reconfigures(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            build_dir = Path(tmp)
+            # What a failed configure leaves behind.
+            self._write_cache(build_dir)
+            (build_dir / "CMakeFiles").mkdir()
+            self.assertEqual(self._configure(build_dir).call_count, 1)
+
+    def test_complete_build_dir_skips_configure(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            build_dir = Path(tmp)
+            self._write_cache(build_dir)
+            self._write(build_dir / "CMakeFiles" / "cmake.check_cache", "", 200)
+            self._write(build_dir / "Makefile", "", 200)
+            self._configure(build_dir).assert_not_called()
+
+
+class SettingsCacheTests(TestCase):
+    def test_settings_file_reparsed_only_when_changed(self) -> None:
+        from python.dev_tool import config
+
+        with tempfile.TemporaryDirectory() as tmp:
+            settings_path = Path(tmp) / "settings.json"
+            settings_path.write_text('{"build_type": "Release"}', encoding="utf-8")
+            with mock.patch.object(config, "_config_path", return_value=settings_path), \
+                mock.patch.object(config, "_SETTINGS_CACHE", None), \
+                mock.patch.object(config, "json_loads", wraps=config.json_loads) as loads:
+                self.assertEqual(config._load_settings_file(), {"build_type": "Release"})
+                self.assertEqual(config._load_settings_file(), {"build_type": "Release"})
+                self.assertEqual(loads.call_count, 1)
+
+                config.save_settings({"build_type": "RelWithDebInfo"})
+                self.assertEqual(config._load_settings_file()["build_type"], "RelWithDebInfo")
+                self.assertEqual(loads.call_count, 2)
+
+
+class DetectionCacheTests(TestCase):
+    def setUp(self) -> None:
+        from python.dev_tool.qt import clear_toolchain_caches
+
+        clear_toolchain_caches()
+        self.addCleanup(clear_toolchain_caches)
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.tmp_path = Path(tmp.name)
+        env = mock.patch.dict(
+            os.environ,
+            {"XDG_CONFIG_HOME": str(self.tmp_path / "config"), "APPDATA": str(self.tmp_path / "config")},
+        )
+        env.start()
+        self.addCleanup(env.stop)
+
+    @staticmethod
+    def _touch_later(path: Path) -> None:
+        stat = path.stat()
+        os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+    def test_compiler_entry_invalidated_when_executable_changes(self) -> None:
+        from python.dev_tool import qt
+
+        compiler = self.tmp_path / "fake-c++"
+        compiler.write_text("#!/bin/sh\n", encoding="utf-8")
+        compiler.chmod(0o755)
+        result = (f"{compiler} (from $CXX)", None, [])
+        with mock.patch.dict(os.environ, {"CXX": str(compiler)}), \
+            mock.patch.object(qt, "detect_compiler", return_value=result) as detect:
+            self.assertEqual(qt._cached_detect_compiler(None), result)
+            self.assertEqual(qt._cached_detect_compiler(None), result)
+            self.assertEqual(detect.call_count, 1)
+
+            self._touch_later(compiler)
+            qt._cached_detect_compiler(None)
+            self.assertEqual(detect.call_count, 2)
+
+            compiler.unlink()
+            qt._cached_detect_compiler(None)
+            self.assertEqual(detect.call_count, 3)
+
+    def test_qt_prefix_entry_invalidated_by_new_kit_or_compiler(self) -> None:
+        from python.dev_tool import qt
+
+        version_dir = self.tmp_path / "third_party" / "qt6" / "6.7.0"
+        prefix = version_dir / "gcc_64"
+        prefix.mkdir(parents=True)
+        with mock.patch.object(qt, "ROOT", self.tmp_path), \
+            mock.patch.dict(os.environ, {"CXX": "g++"}), \
+            mock.patch.object(qt, "resolve_qt_prefix", return_value=prefix) as resolve:
+            self.assertEqual(qt._cached_resolve_qt_prefix(None, None), prefix)
+            self.assertEqual(qt._cached_resolve_qt_prefix(None, None), prefix)
+            self.assertEqual(resolve.call_count, 1)
+
+            # A new kit under an existing <version> dir only touches that dir.
+            (version_dir / "clang_64").mkdir()
+            self._touch_later(version_dir)
+            qt._cached_resolve_qt_prefix(None, None)
+            self.assertEqual(resolve.call_count, 2)
+
+            with mock.patch.dict(os.environ, {"CXX": "clang++"}):
+                qt._cached_resolve_qt_prefix(None, None)
+            self.assertEqual(resolve.call_count, 3)
+
+
+class HttpFetchTests(TestCase):
+    def setUp(self) -> None:
+        # Start from an environment without any proxy configuration.
+        env = {key: value for key, value in os.environ.items() if not key.lower().endswith("_proxy")}
+        patcher = mock.patch.dict(os.environ, env, clear=True)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    @staticmethod
+    def _response(status: int, location: str = "") -> mock.Mock:
+        resp = mock.Mock(status=status, reason="reason")
+        resp.getheader.side_effect = lambda name: location or None
+        return resp
+
+    def test_direct_request_follows_redirects(self) -> None:
+        from python.dev_tool import utils
+
+        replies = [
+            (self._response(302, "/qt/6.8/"), b""),
+            (self._response(301, "https://mirror.example/qt/6.8/"), b""),
+            (self._response(200), b"listing"),
+        ]
+        with mock.patch.object(utils, "_http_get", side_effect=replies) as http_get:
+            _, body = utils._open_url("https://download.example/qt/", timeout=5)
+
+        self.assertEqual(body, b"listing")
+        self.assertEqual(
+            [call.args[0] for call in http_get.call_args_list],
+            [
+                "https://download.example/qt/",
+                "https://download.example/qt/6.8/",
+                "https://mirror.example/qt/6.8/",
+            ],
+        )
+
+    def test_redirect_loop_and_http_errors_raise(self) -> None:
+        from python.dev_tool import utils
+
+        loop = (self._response(302, "/again"), b"")
+        with mock.patch.object(utils, "_http_get", return_value=loop):
+            with self.assertRaises(OSError):
+                utils._open_url("https://download.example/", timeout=5)
+        with mock.patch.object(utils, "_http_get", return_value=(self._response(404), b"")):
+            with self.assertRaises(OSError):
+                utils._open_url("https://download.example/", timeout=5)
+
+    def test_proxied_request_goes_through_urllib(self) -> None:
+        from python.dev_tool import utils
+
+        resp = mock.MagicMock()
+        resp.__enter__.return_value = resp
+        resp.read.return_value = b"listing"
+        with mock.patch.dict(os.environ, {"https_proxy": "http://proxy.example:3128"}), \
+            mock.patch("urllib.request.urlopen", return_value=resp) as urlopen, \
+            mock.patch.object(utils, "_http_get") as http_get:
+            _, body = utils._open_url("https://download.example/qt/", timeout=5)
+
+        self.assertEqual(body, b"listing")
+        http_get.assert_not_called()
+        self.assertEqual(urlopen.call_args.args[0].full_url, "https://download.example/qt/")
+
+    def test_no_proxy_host_uses_pooled_connection(self) -> None:
+        from python.dev_tool import utils
+
+        with mock.patch.dict(
+            os.environ,
+            {"https_proxy": "http://proxy.example:3128", "no_proxy": "download.example"},
+        ), \
+            mock.patch("urllib.request.urlopen") as urlopen, \
+            mock.patch.object(utils, "_http_get", return_value=(self._response(200), b"ok")):
+            _, body = utils._open_url("https://download.example/qt/", timeout=5)
+
+        self.assertEqual(body, b"ok")
+        urlopen.assert_not_called()
+
+
+class QtCreatorLookupTests(TestCase):
+    def test_name_priority_wins_over_walk_order(self) -> None:
+        from python.dev_tool.qml import _find_qt_creator_in_tree
+
+        with tempfile.TemporaryDirectory() as tmp:
+            root = Path(tmp)
+            (root / "Qt Creator").write_text("", encoding="utf-8")
+            preferred = root / "Tools" / "QtCreator" / "bin" / "qtcreator"
+            preferred.parent.mkdir(parents=True)
+            preferred.write_text("", encoding="utf-8")
+            if os.name != "nt":
+                # A dangling link carrying the best name is not an executable.
+                (root / "qtcreator.exe").symlink_to(root / "missing")
+
+            self.assertEqual(_find_qt_creator_in_tree(root), preferred)
@@ -0,0 +1,100 @@
+import argparse
+import os
+import tempfile
+from pathlib import Path
+from unittest import TestCase, mock
+
+from python.download_qt6 import cli, downloader
+
+
+class InstallManifestTests(TestCase):
+    def setUp(self) -> None:
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.output_dir = Path(tmp.name)
+
+    def _args(self, modules, **overrides) -> argparse.Namespace:
+        values = dict(
+            host="linux",
+            target="desktop",
+            qt_version="6.7.2",
+            compiler="linux_gcc_64",
+            output_dir=str(self.output_dir),
+            modules=modules,
+            force=False,
+            dry_run=False,
+        )
+        values.update(overrides)
+        return argparse.Namespace(**values)
+
+    def _unpack(self, arch_dir: str = "gcc_64") -> None:
+        (self.output_dir / "6.7.2" / arch_dir / "bin").mkdir(parents=True, exist_ok=True)
+
+    def test_all_archives_install_covers_any_request(self) -> None:
+        self._unpack()
+        downloader.record_qt_install(self._args([]))
+        self.assertTrue(downloader.qt_install_is_recorded(self._args([])))
+        self.assertTrue(downloader.qt_install_is_recorded(self._args(["qtbase", "qtcharts"])))
+
+    def test_subset_install_does_not_cover_superset_or_all_archives(self) -> None:
+        self._unpack()
+        downloader.record_qt_install(self._args(["qtbase", "qtdeclarative"]))
+        self.assertTrue(downloader.qt_install_is_recorded(self._args(["qtbase"])))
+        self.assertFalse(downloader.qt_install_is_recorded(self._args(["qtbase", "qtcharts"])))
+        self.assertFalse(downloader.qt_install_is_recorded(self._args([])))
+
+        # aqt adds archives to the existing tree, so the record is merged.
+        downloader.record_qt_install(self._args(["qtcharts"]))
+        self.assertTrue(
+            downloader.qt_install_is_recorded(self._args(["qtbase", "qtdeclarative", "qtcharts"]))
+        )
+        downloader.record_qt_install(self._args([]))
+        self.assertTrue(downloader.qt_install_is_recorded(self._args(["qtmultimedia"])))
+
+    def test_record_requires_arch_dir_of_the_compiler(self) -> None:
+        downloader.record_qt_install(self._args([]))
+        self.assertFalse(downloader.qt_install_is_recorded(self._args([])))
+
+        # Another compiler's tree under the same version does not count.
+        self._unpack("gcc_arm64")
+        self.assertFalse(downloader.qt_install_is_recorded(self._args([])))
+        self._unpack("gcc_64")
+        self.assertTrue(downloader.qt_install_is_recorded(self._args([])))
+
+    def test_arch_dir_names(self) -> None:
+        self.assertEqual(downloader._qt_arch_dir("windows", "win64_msvc2022_64", "6.7.2"), "msvc2022_64")
+        self.assertEqual(downloader._qt_arch_dir("linux", "linux_gcc_arm64", "6.7.2"), "gcc_arm64")
+        self.assertEqual(downloader._qt_arch_dir("mac", "clang_64", "6.7.2"), "macos")
+        self.assertEqual(downloader._qt_arch_dir("mac", "clang_64", "6.1.0"), "clang_64")
+        self.assertIsNone(downloader._qt_arch_dir("windows", "win64_mingw", "6.7.2"))
+
+    def test_unpredictable_arch_falls_back_to_any_bin_dir(self) -> None:
+        args = self._args([], host="windows", compiler="win64_mingw")
+        downloader.record_qt_install(args)
+        (self.output_dir / "6.7.2" / "mingw_64").mkdir(parents=True)
+        self.assertFalse(downloader.qt_install_is_recorded(args))
+        self._unpack("mingw_64")
+        self.assertTrue(downloader.qt_install_is_recorded(args))
+
+    def test_install_skipped_unless_forced(self) -> None:
+        self._unpack()
+        downloader.record_qt_install(self._args([]))
+        with mock.patch.object(cli, "build_install_qt_cmd", return_value=["aqt"]), \
+            mock.patch.object(cli, "run") as run:
+            cli._install_qt(self._args(["qtbase"]), True, None)
+            run.assert_not_called()
+
+            cli._install_qt(self._args(["qtbase"], force=True), True, None)
+            run.assert_called_once_with(["aqt"], dry_run=False)
+
+    def test_missing_archives_trigger_install(self) -> None:
+        self._unpack()
+        downloader.record_qt_install(self._args(["qtbase"]))
+        with mock.patch.object(cli, "build_install_qt_cmd", return_value=["aqt"]), \
+            mock.patch.object(cli, "run") as run:
+            cli._install_qt(self._args(["qtbase", "qtcharts"]), True, None)
+        run.assert_called_once()
+        self.assertTrue(
+            downloader.qt_install_is_recorded(self._args(["qtbase", "qtcharts"]))
+        )
+        self.assertTrue(os.path.exists(self.output_dir / downloader.INSTALL_MANIFEST_NAME))